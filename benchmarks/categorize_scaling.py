@@ -0,0 +1,61 @@
+"""Time CachedCategorizer.categorize_batch serially and on 1..N worker processes.
+
+    python -m benchmarks.categorize_scaling [rows] [max_workers]
+
+Descriptions are synthesized from the configured keywords plus random
+merchant names, so nearly every row is a distinct description. Every
+parallel run is checked against the serial labels.
+"""
+import os
+import random
+import string
+import sys
+import time
+
+import pandas as pd
+
+from src.categorizer import CachedCategorizer, KeywordMatcher, ProcessPoolMatcher
+from src.constants.keywords import KEYWORD_CATEGORY_MAPS
+
+
+def synthetic_descriptions(rows: int, seed: int = 0) -> pd.Series:
+    rng = random.Random(seed)
+    keywords = [keyword for obj in KEYWORD_CATEGORY_MAPS for keyword in obj["keywords"]]
+    words = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 9))) for _ in range(5000)]
+    descriptions = []
+    for _ in range(rows):
+        parts = rng.sample(words, 3)
+        if rng.random() < 0.6:
+            parts.insert(rng.randint(0, 3), rng.choice(keywords))
+        descriptions.append(" ".join(parts).upper())
+    return pd.Series(descriptions)
+
+
+def main(rows: int, max_workers: int) -> None:
+    descriptions = synthetic_descriptions(rows)
+    matcher = KeywordMatcher(KEYWORD_CATEGORY_MAPS)
+    print(f"{rows} rows, {descriptions.nunique()} distinct, {os.cpu_count()} CPUs")
+
+    start = time.perf_counter()
+    expected = CachedCategorizer(matcher, maxsize=rows).categorize_batch(descriptions)
+    serial = time.perf_counter() - start
+    print(f"serial     {serial:7.2f}s")
+
+    for workers in range(1, max_workers + 1):
+        pool = ProcessPoolMatcher(workers)
+        categorizer = CachedCategorizer(matcher, pool=pool, parallel_threshold=0)
+        # Start the workers outside the timed run.
+        categorizer.categorize_batch(descriptions.head(workers))
+        start = time.perf_counter()
+        labels = categorizer.categorize_batch(descriptions)
+        elapsed = time.perf_counter() - start
+        pool.shutdown()
+        assert labels.equals(expected), f"labels differ with {workers} workers"
+        print(f"{workers:2d} workers {elapsed:7.2f}s  speedup {serial / elapsed:5.2f}x")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else (os.cpu_count() or 1),
+    )
@@ -0,0 +1,115 @@
+"""Measure GET /transactions latency while a large upload is ingested.
+
+    DATABASE_URL=... python -m benchmarks.read_latency_during_upload [rows] [interval_ms]
+
+Runs the app in process against DATABASE_URL. A reader sends
+GET /transactions every *interval_ms* on an open loop, so a stalled event
+loop shows up as latency rather than as fewer requests. Latencies are
+taken while idle and then while a synthetic Schwab statement of *rows*
+rows is uploaded. The upload is deleted again afterwards.
+"""
+import asyncio
+import csv
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+from src import main as app_main
+
+EXAMPLE_CSV = Path(__file__).resolve().parents[1] / "src" / "bank_csvs" / "charles_schwab_example.csv"
+
+
+def write_statement(path: str, rows: int) -> None:
+    """Write *rows* rows cycling through the Schwab example with distinct amounts."""
+    with open(EXAMPLE_CSV, newline="", encoding="utf-8-sig") as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        examples = list(reader)
+    withdrawal = header.index("Withdrawal")
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f, quoting=csv.QUOTE_ALL)
+        writer.writerow(header)
+        for index in range(rows):
+            row = list(examples[index % len(examples)])
+            row[withdrawal] = f"${index // 100}.{index % 100:02d}"
+            writer.writerow(row)
+
+
+def quantiles(latencies: list[float]) -> str:
+    if len(latencies) < 2:
+        return f"n={len(latencies)}"
+    p99 = statistics.quantiles(latencies, n=100)[98]
+    return (
+        f"p50 {statistics.median(latencies) * 1000:7.1f} ms  p99 {p99 * 1000:7.1f} ms  "
+        f"max {max(latencies) * 1000:7.1f} ms  n={len(latencies)}"
+    )
+
+
+async def run(path: str, interval: float) -> None:
+    transport = httpx.ASGITransport(app=app_main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        latencies: list[float] = []
+
+        async def read(scheduled: float) -> None:
+            response = await client.get("/transactions", params={"limit": 50})
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - scheduled)
+
+        async def reader(stop: asyncio.Event) -> None:
+            requests = []
+            scheduled = time.perf_counter()
+            while not stop.is_set():
+                requests.append(asyncio.create_task(read(scheduled)))
+                scheduled += interval
+                await asyncio.sleep(max(0.0, scheduled - time.perf_counter()))
+            await asyncio.gather(*requests)
+
+        stop = asyncio.Event()
+        reading = asyncio.create_task(reader(stop))
+        await asyncio.sleep(2.0)
+        idle = list(latencies)
+        latencies.clear()
+
+        start = time.perf_counter()
+        with open(path, "rb") as f:
+            response = await client.post(
+                "/transactions", files={"file": ("benchmark.csv", f)}, data={"bank": "schwab"}
+            )
+        upload_seconds = time.perf_counter() - start
+        stop.set()
+        await reading
+        response.raise_for_status()
+        result = response.json()
+
+        print(f"upload       {upload_seconds:7.2f}s  inserted {result['inserted_rows']} rows")
+        print(f"idle         {quantiles(idle)}")
+        print(f"during       {quantiles(latencies)}")
+        if result.get("ingest_id") is not None:
+            await client.request(
+                "DELETE", "/transactions", json={"ingest_id": result["ingest_id"]}
+            )
+
+
+def main(rows: int, interval_ms: float) -> None:
+    logging.disable(logging.INFO)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "statement.csv")
+        write_statement(path, rows)
+        app_main.on_startup()
+        try:
+            asyncio.run(run(path, interval_ms / 1000))
+        finally:
+            app_main.on_shutdown()
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 300_000,
+        float(sys.argv[2]) if len(sys.argv) > 2 else 10.0,
+    )
@@ -0,0 +1,440 @@
+import hashlib
+import math
+import multiprocessing
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from enum import Enum
+from typing import Callable, Iterable, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+UNCATEGORIZED = ("Other", "")
+
+_MONTHS = "jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec"
+_DESCRIPTION_NOISE = [
+    re.compile(pattern)
+    for pattern in (
+        r"\bcd \d{4}\b",  # Lloyds card suffix: "CD 3314"
+        rf"\b\d{{1,2}}(?:{_MONTHS})\d{{2,4}}\b",  # Lloyds dates: "08JUN25"
+        r"\b\d{1,4}[/-]\d{1,2}[/-]\d{2,4}\b",  # numeric dates
+        r"\b\d{1,2}:\d{2}(?::\d{2})?\b",  # times: "08:32"
+        r"\*[a-z0-9]*\d[a-z0-9]*",  # Schwab reference after "*": "*NH5532D02"
+        r"\+?\(?\d{3}\)?[ .-]\d{3}[ .-]\d{4}\b",  # phone numbers
+        r"\b\d{6,}\b",  # long reference numbers
+    )
+]
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_description(description: str) -> str:
+    """Reduce a raw description to a canonical merchant key.
+
+    Lowercases, strips card suffixes, dates, times, phone numbers and
+    reference ids, and collapses whitespace, so the same merchant maps to
+    the same key across statements.
+    """
+    key = description.lower()
+    for pattern in _DESCRIPTION_NOISE:
+        key = pattern.sub(" ", key)
+    return _WHITESPACE.sub(" ", key).strip()
+
+
+def label_value(value: Union[Enum, str]) -> str:
+    """Return a category label as text: keyword maps carry enums, database rules strings."""
+    return value.value if isinstance(value, Enum) else value
+
+
+def keyword_maps_fingerprint(keyword_maps: Iterable[dict]) -> str:
+    """Return a stable hash of the keyword maps, used to detect rule changes."""
+    digest = hashlib.sha1()
+    for obj in keyword_maps:
+        label = (label_value(obj["category"]), label_value(obj["sub_category"]))
+        digest.update(repr(label).encode())
+        digest.update(repr(list(obj["keywords"])).encode())
+    return digest.hexdigest()
+
+
+def _label_columns(labels: Sequence[tuple[str, str]]) -> dict[str, list[str]]:
+    return {
+        "category": [label[0] for label in labels],
+        "sub_category": [label[1] for label in labels],
+    }
+
+
+def _categorize_distinct(
+    descriptions: pd.Series,
+    categorize_uniques: Callable[[Sequence[str]], dict[str, list[str]]],
+) -> pd.DataFrame:
+    """Run *categorize_uniques* on the distinct descriptions and broadcast its columns back."""
+    codes, uniques = pd.factorize(descriptions.fillna(""), sort=False)
+    columns = categorize_uniques(uniques)
+    return pd.DataFrame(
+        {name: np.array(values, dtype=object).take(codes) for name, values in columns.items()},
+        index=descriptions.index,
+    )
+
+
+# Inline flags that apply to a whole pattern, e.g. "(?i)"
+_GLOBAL_FLAGS = re.compile(r"\(\?([aiLmsux]+)\)")
+# A numeric backreference at the start of the text, e.g. "\1" or "\12"
+_BACKREFERENCE = re.compile(r"\\([1-9][0-9]?)")
+# A three-digit octal escape, which Python reads instead of a backreference
+_OCTAL_ESCAPE = re.compile(r"\\[0-7]{3}")
+# A conditional on a group number, e.g. "(?(1)"
+_GROUP_CONDITIONAL = re.compile(r"\(\?\(([0-9]+)\)")
+
+
+def _renumber_groups(keyword: str, offset: int) -> str:
+    """Shift the group numbers *keyword* refers to by *offset*.
+
+    Rewrites numeric backreferences and ``(?(N)…)`` conditionals outside
+    character classes; everything else is copied as is.
+    """
+    out = []
+    position = 0
+    in_class = False
+
+    def shifted(reference: str) -> str:
+        number = int(reference) + offset
+        if number > 99:
+            raise re.error(f"group reference \\{number} out of range once rules are combined")
+        return str(number)
+
+    while position < len(keyword):
+        char = keyword[position]
+        if char == "\\":
+            backreference = _BACKREFERENCE.match(keyword, position)
+            if in_class or backreference is None or _OCTAL_ESCAPE.match(keyword, position):
+                out.append(keyword[position:position + 2])
+                position += 2
+                continue
+            out.append("\\" + shifted(backreference.group(1)))
+            position = backreference.end()
+            # Keep a following digit from extending the new number.
+            if keyword[position:position + 1].isdigit():
+                out.append("(?:)")
+            continue
+        if in_class:
+            in_class = char != "]"
+        elif char == "[":
+            in_class = True
+            # A leading "^" and then a leading "]" are part of the class.
+            end = position + 1
+            if keyword[end:end + 1] == "^":
+                end += 1
+            if keyword[end:end + 1] == "]":
+                end += 1
+            out.append(keyword[position:end])
+            position = end
+            continue
+        else:
+            conditional = _GROUP_CONDITIONAL.match(keyword, position)
+            if conditional is not None:
+                out.append(f"(?({shifted(conditional.group(1))})")
+                position = conditional.end()
+                continue
+        out.append(char)
+        position += 1
+    return "".join(out)
+
+
+def _isolate_keyword(keyword: str, groups_before: int) -> str:
+    """Rewrite *keyword* to match inside the combined pattern exactly as it does alone.
+
+    Leading global flags such as ``(?i)`` become a scoped ``(?i:…)`` group,
+    since they are only allowed at the start of a whole pattern, and group
+    numbers are shifted past the *groups_before* capturing groups that
+    precede the keyword in the combined pattern.
+    """
+    flags = ""
+    found = _GLOBAL_FLAGS.match(keyword)
+    while found is not None:
+        flags += found.group(1)
+        keyword = keyword[found.end():]
+        found = _GLOBAL_FLAGS.match(keyword)
+    if groups_before:
+        keyword = _renumber_groups(keyword, groups_before)
+    if flags:
+        # In verbose mode a trailing comment would swallow the closing ")".
+        end = "\n)" if "x" in flags else ")"
+        keyword = f"(?{flags}:{keyword}{end}"
+    return keyword
+
+
+class KeywordMatcher:
+    """Compiled first-match-wins matcher over a list of keyword map entries.
+
+    All entries are folded into one regex: every entry becomes an alternation
+    branch anchored at the start of the text with a lookahead for any of its
+    keywords. Branches are tried in map order, so the first entry with a
+    matching keyword wins, exactly like walking the map keyword by keyword
+    with ``re.search``. Keywords are rewritten where needed (see
+    :func:`_isolate_keyword`) so that flags and backreferences keep their
+    meaning. Raises ``re.error`` when a keyword, or the combined pattern,
+    does not compile.
+
+    *version* identifies the rule set the matcher was built from (the
+    ``category_rules`` version for database rules, None for static maps).
+    """
+
+    def __init__(self, keyword_maps: Iterable[dict], version: Optional[int] = None):
+        keyword_maps = list(keyword_maps)
+        self.version = version
+        self.fingerprint = keyword_maps_fingerprint(keyword_maps)
+        self.labels: list[tuple[str, str]] = []
+        branches = []
+        # Capturing groups so far in the combined pattern, counting each
+        # branch's own marker group
+        groups = 0
+        for obj in keyword_maps:
+            keywords = [keyword.lower() for keyword in obj["keywords"]]
+            if not keywords:
+                continue
+            group = f"c{len(self.labels)}"
+            self.labels.append((label_value(obj["category"]), label_value(obj["sub_category"])))
+            alternatives = []
+            for keyword in keywords:
+                alternatives.append(f"(?:{_isolate_keyword(keyword, groups)})")
+                groups += re.compile(keyword).groups
+            alternation = "|".join(alternatives)
+            branches.append(f"(?=(?s:.*?)(?:{alternation}))(?P<{group}>)")
+            groups += 1
+        self.pattern: Optional[re.Pattern] = (
+            re.compile(r"\A(?:" + "|".join(branches) + ")") if branches else None
+        )
+
+    def match(self, description: str) -> tuple[str, str]:
+        """Return the (category, sub_category) for *description*."""
+        if self.pattern is None:
+            return UNCATEGORIZED
+        found = self.pattern.match(description.lower())
+        if found is None:
+            return UNCATEGORIZED
+        return self.labels[int(found.lastgroup[1:])]
+
+    def match_batch(self, descriptions: pd.Series) -> pd.DataFrame:
+        """Categorize a column of descriptions, matching each distinct value once.
+
+        Returns a frame with ``category`` and ``sub_category`` columns aligned
+        to the index of *descriptions*. Missing descriptions are uncategorized.
+        """
+        return _categorize_distinct(
+            descriptions,
+            lambda uniques: _label_columns([self.match(description) for description in uniques]),
+        )
+
+
+# Matcher of the current worker process, built once by _init_worker.
+_WORKER_MATCHER: Optional[KeywordMatcher] = None
+
+
+def _init_worker(matcher: KeywordMatcher) -> None:
+    global _WORKER_MATCHER
+    _WORKER_MATCHER = matcher
+
+
+def _match_shard(descriptions: Sequence[str]) -> list[tuple[str, tuple[str, str]]]:
+    match = _WORKER_MATCHER.match
+    keys = [normalize_description(description) for description in descriptions]
+    return [(key, match(key)) for key in keys]
+
+
+class ProcessPoolMatcher:
+    """Normalize and match descriptions on a pool of worker processes.
+
+    Each worker receives the matcher once, through the pool initializer, so
+    tasks only carry descriptions. The pool is started lazily and rebuilt
+    when asked to match with a matcher built from different keyword maps.
+    Workers are spawned rather than forked, so they never inherit the
+    threads and connections of the API process.
+    """
+
+    def __init__(self, workers: int, shards_per_worker: int = 4):
+        self.workers = workers
+        self.shards_per_worker = shards_per_worker
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._fingerprint: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def _pool_for(self, matcher: KeywordMatcher) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None or self._fingerprint != matcher.fingerprint:
+                if self._pool is not None:
+                    self._pool.shutdown(wait=False)
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(matcher,),
+                )
+                self._fingerprint = matcher.fingerprint
+            return self._pool
+
+    def match(
+        self, matcher: KeywordMatcher, descriptions: Sequence[str]
+    ) -> list[tuple[str, tuple[str, str]]]:
+        """Return ``(normalize_description(d), label)`` for each of *descriptions*.
+
+        The label is ``matcher.match`` of the key; the keys are returned so
+        callers need not normalize the descriptions again.
+        """
+        pool = self._pool_for(matcher)
+        shard_size = max(1, math.ceil(len(descriptions) / (self.workers * self.shards_per_worker)))
+        shards = [
+            list(descriptions[start:start + shard_size])
+            for start in range(0, len(descriptions), shard_size)
+        ]
+        return [keyed for labels in pool.map(_match_shard, shards) for keyed in labels]
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True)
+                self._pool = None
+
+
+class CachedCategorizer:
+    """Categorize by merchant key, keeping results in a bounded LRU cache.
+
+    Descriptions are reduced with :func:`normalize_description` and matched
+    on that key, so repeat merchants skip matching entirely. The cache is
+    cleared whenever the matcher is swapped for one built from different
+    keyword maps.
+
+    With a *pool*, each :meth:`categorize_batch` call with at least
+    *parallel_threshold* distinct descriptions is matched on its worker
+    processes instead, bypassing the cache; the labels are identical to the
+    serial path. Callers that categorize a large input in pieces, such as
+    streamed upload chunks, only reach the pool if a piece reaches the
+    threshold.
+    """
+
+    def __init__(
+        self,
+        matcher: KeywordMatcher,
+        maxsize: int = 10_000,
+        pool: Optional[ProcessPoolMatcher] = None,
+        parallel_threshold: int = 20_000,
+    ):
+        self.matcher = matcher
+        self.maxsize = maxsize
+        self.pool = pool
+        self.parallel_threshold = parallel_threshold
+        self._cache: OrderedDict[str, tuple[str, str]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def use_matcher(self, matcher: KeywordMatcher) -> None:
+        """Swap in *matcher*, invalidating the cache if the rules changed."""
+        with self._lock:
+            if matcher.fingerprint != self.matcher.fingerprint:
+                self._cache.clear()
+            self.matcher = matcher
+
+    def use_keyword_maps(self, keyword_maps: Iterable[dict]) -> None:
+        """Rebuild the matcher from *keyword_maps* if they differ from the current rules."""
+        keyword_maps = list(keyword_maps)
+        if keyword_maps_fingerprint(keyword_maps) != self.matcher.fingerprint:
+            self.use_matcher(KeywordMatcher(keyword_maps))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def stats(self) -> dict[str, int]:
+        """Return cache counters: size, maxsize, hits, misses and evictions."""
+        with self._lock:
+            return {
+                "size": len(self._cache),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def snapshot(self) -> "CategorizerSnapshot":
+        """Pin the current matcher, so a multi-chunk upload sees one rule version."""
+        with self._lock:
+            return CategorizerSnapshot(self, self.matcher)
+
+    def categorize(
+        self, description: str, matcher: Optional[KeywordMatcher] = None
+    ) -> tuple[str, str]:
+        """Return the (category, sub_category) for *description*.
+
+        With *matcher* the lookup uses that matcher; the cache is only
+        consulted while it has the same rules as the current one.
+        """
+        return self._categorize_key(normalize_description(description), matcher)
+
+    def _categorize_key(
+        self, key: str, matcher: Optional[KeywordMatcher] = None
+    ) -> tuple[str, str]:
+        with self._lock:
+            if matcher is None:
+                matcher = self.matcher
+            cacheable = matcher.fingerprint == self.matcher.fingerprint
+            label = self._cache.get(key) if cacheable else None
+            if label is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return label
+            self.misses += 1
+        label = matcher.match(key)
+        with self._lock:
+            if matcher.fingerprint == self.matcher.fingerprint:
+                self._cache[key] = label
+                if len(self._cache) > self.maxsize:
+                    self._cache.popitem(last=False)
+                    self.evictions += 1
+        return label
+
+    def categorize_batch(
+        self, descriptions: pd.Series, matcher: Optional[KeywordMatcher] = None
+    ) -> pd.DataFrame:
+        """Categorize a column of descriptions, looking up each distinct value once.
+
+        Returns a frame with ``merchant_key``, ``category`` and
+        ``sub_category`` columns aligned to the index of *descriptions*, so
+        callers that also need the keys do not normalize again. Missing
+        descriptions are uncategorized.
+        """
+        matcher = matcher or self.matcher
+        return _categorize_distinct(
+            descriptions, lambda uniques: self._categorize_uniques(uniques, matcher)
+        )
+
+    def _categorize_uniques(
+        self, descriptions: Sequence[str], matcher: KeywordMatcher
+    ) -> dict[str, list[str]]:
+        if self.pool is not None and len(descriptions) >= self.parallel_threshold:
+            keyed = self.pool.match(matcher, descriptions)
+            keys = [key for key, _ in keyed]
+            labels = [label for _, label in keyed]
+        else:
+            keys = [normalize_description(description) for description in descriptions]
+            labels = [self._categorize_key(key, matcher) for key in keys]
+        return {"merchant_key": keys, **_label_columns(labels)}
+
+
+class CategorizerSnapshot:
+    """A :class:`CachedCategorizer` pinned to one matcher, sharing its cache."""
+
+    def __init__(self, categorizer: CachedCategorizer, matcher: KeywordMatcher):
+        self.categorizer = categorizer
+        self.matcher = matcher
+
+    @property
+    def version(self) -> Optional[int]:
+        return self.matcher.version
+
+    def categorize(self, description: str) -> tuple[str, str]:
+        return self.categorizer.categorize(description, self.matcher)
+
+    def categorize_batch(self, descriptions: pd.Series) -> pd.DataFrame:
+        return self.categorizer.categorize_batch(descriptions, self.matcher)
@@ -0,0 +1,232 @@
+"""Offline batch categorization: ``python -m src statements/ -o out/``.
+
+Runs the same parse, normalize and categorize pipeline as ``POST
+/transactions`` over many CSV files in parallel, without a database, and
+writes one categorized file per input plus a per-category totals report.
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+
+from .categorizer import CachedCategorizer, KeywordMatcher
+from .constants.bank import Bank
+from .constants.keywords import KEYWORD_CATEGORY_MAPS
+from .ingest import (
+    InvalidStatementError,
+    MalformedCSVError,
+    bank_profile,
+    detect_bank,
+    prepare_transactions,
+    read_statement,
+)
+
+OUTPUT_COLUMNS = [
+    "date", "description", "withdrawal", "deposit", "category", "sub_category", "currency",
+]
+TOTALS_KEYS = ["currency", "category", "sub_category"]
+
+# Categorizer of the current worker process, built once by _init_worker.
+_CATEGORIZER: Optional[CachedCategorizer] = None
+
+
+@dataclass
+class FileResult:
+    path: str
+    rows: int = 0
+    output: Optional[str] = None
+    totals: Optional[pd.DataFrame] = None
+    error: Optional[str] = None
+
+
+def _init_worker() -> None:
+    global _CATEGORIZER
+    _CATEGORIZER = CachedCategorizer(KeywordMatcher(KEYWORD_CATEGORY_MAPS))
+
+
+def _glob_root(pattern: str) -> str:
+    """Return the leading directories of *pattern* that contain no wildcards."""
+    parts = []
+    for part in Path(pattern).parts[:-1]:
+        if glob.has_magic(part):
+            break
+        parts.append(part)
+    return os.path.join(*parts) if parts else "."
+
+
+def find_statements(inputs: list[str]) -> dict[str, str]:
+    """Expand directories (their ``*.csv`` files), glob patterns and plain paths.
+
+    Maps each path to its name relative to the directory or the glob's
+    fixed leading directories it was found under; a plain path's name is
+    its file name.
+    """
+    paths: dict[str, str] = {}
+    for entry in inputs:
+        if os.path.isdir(entry):
+            found = sorted(glob.glob(os.path.join(entry, "*.csv")))
+            root = entry
+        elif glob.has_magic(entry):
+            found = sorted(glob.glob(entry, recursive=True))
+            root = _glob_root(entry)
+        else:
+            found = [entry]
+            root = os.path.dirname(entry) or "."
+        for path in found:
+            paths.setdefault(os.path.normpath(path), os.path.relpath(path, root))
+    return paths
+
+
+def output_path(relative: str, output_dir: str, fmt: str) -> str:
+    """Return where the input named *relative* is written, mirroring its directories."""
+    return os.path.join(output_dir, f"{os.path.splitext(relative)[0]}.categorized.{fmt}")
+
+
+def conflicting_outputs(targets: dict[str, str]) -> dict[str, list[str]]:
+    """Return the output paths that more than one input of *targets* (input -> output) would write."""
+    inputs_by_target: dict[str, list[str]] = {}
+    for path, target in targets.items():
+        inputs_by_target.setdefault(os.path.normcase(os.path.normpath(target)), []).append(path)
+    return {target: paths for target, paths in inputs_by_target.items() if len(paths) > 1}
+
+
+def categorize_file(
+    path: str, bank: Optional[Bank], target: str, fmt: str, chunk_rows: int
+) -> FileResult:
+    """Categorize the statement at *path* and write it to *target*.
+
+    The bank is detected from the file's header when *bank* is None.
+    """
+    frames = []
+    totals: Optional[pd.DataFrame] = None
+    rows = 0
+    try:
+        if bank is None:
+            bank = detect_bank(path)
+        _, currency, _ = bank_profile(bank)
+        for chunk in read_statement(path, bank, chunk_rows=chunk_rows):
+            transactions = prepare_transactions(chunk, bank, _CATEGORIZER)
+            transactions["currency"] = currency
+            groups = transactions.groupby(TOTALS_KEYS, dropna=False)
+            partial = groups[["withdrawal_cents", "deposit_cents"]].sum()
+            partial["rows"] = groups.size()
+            totals = partial if totals is None else totals.add(partial, fill_value=0)
+            transactions["withdrawal"] = transactions["withdrawal_cents"] / 100
+            transactions["deposit"] = transactions["deposit_cents"] / 100
+            transactions = transactions[OUTPUT_COLUMNS]
+            if fmt == "csv":
+                # Append chunk by chunk so memory stays flat for large files.
+                first = rows == 0
+                transactions.to_csv(target, mode="w" if first else "a", header=first, index=False)
+            else:
+                frames.append(transactions)
+            rows += len(transactions)
+    except (FileNotFoundError, MalformedCSVError, InvalidStatementError) as exc:
+        return FileResult(path=path, error=str(exc))
+    if rows == 0:
+        return FileResult(path=path, error="no rows")
+    if fmt == "parquet":
+        pd.concat(frames, ignore_index=True).to_parquet(target, index=False)
+    return FileResult(path=path, rows=rows, output=target, totals=totals)
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m src",
+        description="Categorize bank statement CSVs offline and report per-category totals.",
+    )
+    parser.add_argument("inputs", nargs="+", help="CSV files, directories of CSVs, or glob patterns")
+    parser.add_argument(
+        "-b", "--bank", choices=[bank.value for bank in Bank],
+        help="Bank the statements come from (default: detected per file from its header)",
+    )
+    parser.add_argument(
+        "-o", "--output-dir", default="categorized", help="Output directory (default: categorized)"
+    )
+    parser.add_argument(
+        "-f", "--format", default="csv", choices=["csv", "parquet"], help="Output format (default: csv)"
+    )
+    parser.add_argument(
+        "-j", "--workers", type=int, default=os.cpu_count() or 1,
+        help="Files processed in parallel (default: CPU count)",
+    )
+    parser.add_argument(
+        "--chunk-rows", type=int, default=50_000, help="Rows parsed per chunk (default: 50000)"
+    )
+    args = parser.parse_args(argv)
+    if args.format == "parquet":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            parser.error("--format parquet requires pyarrow (pip install pyarrow)")
+    return args
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = parse_args(argv)
+    paths = find_statements(args.inputs)
+    if not paths:
+        print("No CSV files found", file=sys.stderr)
+        return 1
+    targets = {
+        path: output_path(relative, args.output_dir, args.format)
+        for path, relative in paths.items()
+    }
+    # Two inputs writing one file would silently keep only one of them.
+    conflicts = conflicting_outputs(targets)
+    if conflicts:
+        for target, inputs in conflicts.items():
+            print(f"✗ {', '.join(inputs)} would all be written to {target}", file=sys.stderr)
+        return 1
+    for target in targets.values():
+        os.makedirs(os.path.dirname(target) or ".", exist_ok=True)
+    bank = Bank(args.bank) if args.bank else None
+    jobs = [(path, bank, target, args.format, args.chunk_rows) for path, target in targets.items()]
+
+    start = time.perf_counter()
+    if args.workers > 1 and len(paths) > 1:
+        workers = min(args.workers, len(paths))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+            results = list(pool.map(categorize_file, *zip(*jobs)))
+    else:
+        _init_worker()
+        results = [categorize_file(*job) for job in jobs]
+    elapsed = time.perf_counter() - start
+
+    failed = [result for result in results if result.error]
+    done = [result for result in results if not result.error]
+    for result in failed:
+        print(f"✗ {result.path}: {result.error}", file=sys.stderr)
+    for result in done:
+        print(f"✔ {result.path} -> {result.output} ({result.rows} rows)")
+
+    if done:
+        totals = (
+            pd.concat([result.totals for result in done])
+            .groupby(level=TOTALS_KEYS, dropna=False)
+            .sum()
+        )
+        totals = pd.DataFrame({
+            "withdrawal": totals["withdrawal_cents"].astype("int64") / 100,
+            "deposit": totals["deposit_cents"].astype("int64") / 100,
+            "rows": totals["rows"].astype("int64"),
+        })
+        totals = totals.reset_index().sort_values(TOTALS_KEYS)
+        totals_path = os.path.join(args.output_dir, "totals.csv")
+        totals.to_csv(totals_path, index=False)
+        print(totals.to_string(index=False))
+        print(f"✔ Totals saved to {Path(totals_path).resolve()}")
+
+    rows = sum(result.rows for result in done)
+    print(
+        f"{len(done)} file(s), {rows} rows in {elapsed:.2f}s: "
+        f"{rows / elapsed:,.0f} rows/s, {len(done) / elapsed:.2f} files/s"
+    )
+    return 1 if failed else 0
@@ -0,0 +1,2 @@
+# Package init for db
+
@@ -0,0 +1,352 @@
+import csv
+from io import StringIO
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+
+TRANSACTION_COLUMNS = [
+    "date",
+    "description",
+    "withdrawal_cents",
+    "deposit_cents",
+    "sub_category_id",
+    "bank_id",
+]
+
+# Columns of the frame handed to write_transactions: the table columns plus
+# the merchant key, an input of the row fingerprint.
+STAGING_COLUMNS = TRANSACTION_COLUMNS + ["merchant_key"]
+
+# Rows serialized per to_csv step; small steps keep each GIL hold short.
+COPY_CHUNK_ROWS = 5000
+
+_CREATE_STAGING_SQL = """
+    CREATE TEMP TABLE IF NOT EXISTS transactions_staging (
+        date            DATE,
+        description     TEXT,
+        withdrawal_cents BIGINT,
+        deposit_cents   BIGINT,
+        sub_category_id INTEGER,
+        bank_id         INTEGER,
+        merchant_key    TEXT,
+        position        INTEGER
+    ) ON COMMIT DELETE ROWS
+"""
+
+# Rows seen so far per (date, merchant key, amounts) in the current
+# transaction, so repeats are numbered across chunks of one upload.
+_CREATE_KEY_COUNTS_SQL = """
+    CREATE TEMP TABLE IF NOT EXISTS transactions_key_counts (
+        key  TEXT PRIMARY KEY,
+        seen INTEGER NOT NULL
+    ) ON COMMIT DELETE ROWS
+"""
+
+# The occurrence index of a row is the number of earlier rows with the same
+# key: those of earlier chunks, read from transactions_key_counts while
+# adding this chunk's counts to it, plus those earlier in this chunk. Only
+# the chunk's own keys are looked up, so the cost of a chunk does not grow
+# with the rows written before it.
+# Amounts enter the fingerprint as whole cents so their text form is canonical.
+_INSERT_FROM_STAGING_SQL = """
+    WITH keyed AS (
+        SELECT s.*, md5(ROW(date, merchant_key, withdrawal_cents, deposit_cents)::text) AS key
+        FROM transactions_staging s
+    ),
+    chunk_counts AS (
+        SELECT key, count(*)::integer AS chunk_rows FROM keyed GROUP BY key
+    ),
+    counted AS (
+        INSERT INTO transactions_key_counts AS k (key, seen)
+        SELECT key, chunk_rows FROM chunk_counts
+        ON CONFLICT (key) DO UPDATE SET seen = k.seen + excluded.seen
+        RETURNING k.key, k.seen
+    ),
+    numbered AS (
+        SELECT
+            keyed.*,
+            counted.seen - chunk_counts.chunk_rows
+                + row_number() OVER (PARTITION BY keyed.key ORDER BY keyed.position) - 1
+                AS occurrence
+        FROM keyed
+        JOIN chunk_counts USING (key)
+        JOIN counted USING (key)
+    )
+    INSERT INTO transactions
+        (date, description, withdrawal_cents, deposit_cents, sub_category_id, bank_id, ingest_id,
+         fingerprint)
+    SELECT
+        date, description, withdrawal_cents, deposit_cents, sub_category_id, bank_id,
+        CAST(:ingest_id AS INTEGER),
+        md5(concat_ws('|',
+            bank_id,
+            date,
+            merchant_key,
+            COALESCE(withdrawal_cents::text, ''),
+            COALESCE(deposit_cents::text, ''),
+            occurrence
+        ))
+    FROM numbered
+    ON CONFLICT DO NOTHING
+"""
+
+
+def _supports_copy(conn) -> bool:
+    return conn.dialect.name == "postgresql" and conn.dialect.driver == "psycopg2"
+
+
+def _copy_frame(conn, table: str, df: pd.DataFrame) -> None:
+    """Stream *df* into *table* with ``COPY FROM STDIN`` through an in-memory CSV."""
+    buffer = StringIO()
+    # Unquoted empty fields are read back as NULL by COPY ... (FORMAT csv).
+    df.to_csv(
+        buffer,
+        index=False,
+        header=False,
+        quoting=csv.QUOTE_MINIMAL,
+        chunksize=COPY_CHUNK_ROWS,
+    )
+    buffer.seek(0)
+    columns = ", ".join(df.columns)
+    cursor = conn.connection.driver_connection.cursor()
+    try:
+        cursor.copy_expert(f"COPY {table} ({columns}) FROM STDIN WITH (FORMAT csv)", buffer)
+    finally:
+        cursor.close()
+
+
+def _executemany_frame(conn, table: str, df: pd.DataFrame) -> None:
+    """Insert *df* into *table* with a single executemany INSERT."""
+    columns = ", ".join(df.columns)
+    placeholders = ", ".join(f":{column}" for column in df.columns)
+    records = df.astype(object).where(df.notna(), None).to_dict("records")
+    conn.execute(text(f"INSERT INTO {table} ({columns}) VALUES ({placeholders})"), records)
+
+
+def write_transactions(conn, df: pd.DataFrame, ingest_id: Optional[int] = None) -> int:
+    """Bulk insert *df* (aligned to ``STAGING_COLUMNS``) into ``transactions``.
+
+    On PostgreSQL/psycopg2 the frame is COPY'd into a session-local staging
+    table and moved across with ``INSERT … SELECT … ON CONFLICT DO NOTHING``,
+    so rows whose fingerprint is already stored are skipped. Identical rows
+    (same date, merchant key and amounts) are told apart in the fingerprint
+    by their occurrence index, counted across every call made in the same
+    database transaction, so a statement written in chunks is numbered as a
+    whole. Other database URLs fall back to ``executemany`` without
+    fingerprints. Every row is tagged with *ingest_id*. Returns the number
+    of rows actually inserted.
+    """
+    if df.empty:
+        return 0
+    df = df[STAGING_COLUMNS].astype(
+        {
+            "withdrawal_cents": "Int64",
+            "deposit_cents": "Int64",
+            "sub_category_id": "Int64",
+            "bank_id": "Int64",
+        }
+    )
+    if not _supports_copy(conn):
+        _executemany_frame(
+            conn, "transactions", df[TRANSACTION_COLUMNS].assign(ingest_id=ingest_id)
+        )
+        return len(df)
+    conn.execute(text(_CREATE_STAGING_SQL))
+    conn.execute(text(_CREATE_KEY_COUNTS_SQL))
+    _copy_frame(conn, "transactions_staging", df.assign(position=np.arange(len(df))))
+    inserted = conn.execute(text(_INSERT_FROM_STAGING_SQL), {"ingest_id": ingest_id}).rowcount
+    conn.execute(text("TRUNCATE transactions_staging"))
+    return inserted
+
+
+def _values_list(
+    rows: Sequence[tuple], types: Sequence[str], params: dict[str, object]
+) -> str:
+    """Return a ``VALUES`` list for *rows*, adding one bind parameter per cell to *params*.
+
+    Every cell is cast to its column's SQL type in *types*, so NULLs and
+    literals need no type inference.
+    """
+    tuples = []
+    for row_index, row in enumerate(rows):
+        cells = []
+        for column_index, (value, sql_type) in enumerate(zip(row, types)):
+            name = f"v{row_index}_{column_index}"
+            params[name] = value
+            cells.append(f"CAST(:{name} AS {sql_type})")
+        tuples.append(f"({', '.join(cells)})")
+    return f"VALUES {', '.join(tuples)}"
+
+
+# Category changes collected by stage_category_changes, applied at once by
+# apply_category_changes.
+_CREATE_CATEGORY_CHANGES_SQL = """
+    CREATE TEMP TABLE IF NOT EXISTS category_changes (
+        description TEXT,
+        old_id      INTEGER,
+        new_id      INTEGER
+    ) ON COMMIT DELETE ROWS
+"""
+
+
+def stage_category_changes(conn, changes: list[tuple[str, Optional[int], int]]) -> None:
+    """Queue category changes in a session-local table for :func:`apply_category_changes`.
+
+    Each change is ``(description, old sub_category_id, new sub_category_id)``.
+    Nothing in ``transactions`` is touched yet, so batches can be staged
+    without a scan of the table each.
+    """
+    conn.execute(text(_CREATE_CATEGORY_CHANGES_SQL))
+    if not changes:
+        return
+    df = pd.DataFrame(changes, columns=["description", "old_id", "new_id"]).astype(
+        {"old_id": "Int64", "new_id": "Int64"}
+    )
+    if _supports_copy(conn):
+        _copy_frame(conn, "category_changes", df)
+    else:
+        _executemany_frame(conn, "category_changes", df)
+
+
+def apply_category_changes(
+    conn,
+    filters: Sequence[str] = (),
+    params: Optional[dict[str, object]] = None,
+) -> dict[int, int]:
+    """Apply every staged category change with one ``UPDATE … FROM`` and clear them.
+
+    A change applies to the rows with its description still in its old
+    category, so rows edited since they were read are left alone. *filters*
+    are extra WHERE conditions on ``transactions t``, bound from *params*.
+    Joining on description, the staged changes are matched in one pass over
+    ``transactions``. Returns the number of rows moved per new
+    ``sub_category_id``.
+    """
+    conn.execute(text(_CREATE_CATEGORY_CHANGES_SQL))
+    # Temp tables are never auto-analyzed; without row counts the planner
+    # may not pick a hash join.
+    conn.execute(text("ANALYZE category_changes"))
+    conditions = " ".join(f"AND {condition}" for condition in filters)
+    rows = conn.execute(
+        text(
+            f"""
+            WITH moved AS (
+                UPDATE transactions t
+                SET sub_category_id = v.new_id
+                FROM category_changes v
+                WHERE t.description = v.description
+                  AND t.sub_category_id IS NOT DISTINCT FROM v.old_id
+                  AND t.sub_category_id IS DISTINCT FROM v.new_id
+                  {conditions}
+                RETURNING t.sub_category_id
+            )
+            SELECT sub_category_id, count(*) FROM moved GROUP BY sub_category_id
+            """
+        ),
+        dict(params or {}),
+    ).fetchall()
+    conn.execute(text("TRUNCATE category_changes"))
+    return {row[0]: row[1] for row in rows}
+
+
+def set_categories(conn, assignments: Sequence[tuple[int, int]]) -> list[int]:
+    """Set ``sub_category_id`` per transaction id with one ``UPDATE … FROM (VALUES …)``.
+
+    *assignments* are ``(transaction id, sub_category_id)`` pairs with
+    distinct ids. Rows already in their target category are not written.
+    Returns the ids of the rows changed.
+    """
+    if not assignments:
+        return []
+    params: dict[str, object] = {}
+    values = _values_list(assignments, ("INTEGER", "INTEGER"), params)
+    return list(
+        conn.execute(
+            text(
+                f"""
+                UPDATE transactions t
+                SET sub_category_id = v.sub_category_id
+                FROM ({values}) AS v (id, sub_category_id)
+                WHERE t.id = v.id AND t.sub_category_id IS DISTINCT FROM v.sub_category_id
+                RETURNING t.id
+                """
+            ),
+            params,
+        ).scalars()
+    )
+
+
+def remap_categories(
+    conn,
+    mapping: Sequence[tuple[Optional[int], int]],
+    filters: Sequence[str] = (),
+    params: Optional[dict[str, object]] = None,
+) -> int:
+    """Move the rows matching *filters* from each old ``sub_category_id`` to a new one.
+
+    *mapping* holds ``(old id, new id)`` pairs; an old id of None matches
+    uncategorized rows. Returns the number of rows changed.
+    """
+    if not mapping:
+        return 0
+    bind: dict[str, object] = dict(params or {})
+    values = _values_list(mapping, ("INTEGER", "INTEGER"), bind)
+    conditions = " ".join(f"AND {condition}" for condition in filters)
+    return conn.execute(
+        text(
+            f"""
+            UPDATE transactions t
+            SET sub_category_id = v.new_id
+            FROM ({values}) AS v (old_id, new_id)
+            WHERE t.sub_category_id IS NOT DISTINCT FROM v.old_id
+              AND t.sub_category_id IS DISTINCT FROM v.new_id
+              {conditions}
+            """
+        ),
+        bind,
+    ).rowcount
+
+
+def delete_transactions(
+    engine, filters: Sequence[str], params: dict[str, object], batch_rows: int = 10_000
+) -> int:
+    """Delete the transactions matching *filters*, *batch_rows* rows per transaction.
+
+    Each batch commits on its own, so no lock is held for longer than one
+    batch and other writers can interleave. Returns the number of rows
+    deleted. An interrupted call leaves the remaining rows in place; running
+    it again finishes the job.
+
+    Uploads that lose rows forget their content hash in the same batch, so
+    sending the file again is not skipped as a duplicate and restores the
+    deleted rows through the row fingerprints.
+    """
+    # ARRAY(...) makes the batch's ids one value, so each row is found
+    # through the primary key rather than by a join that scans the table.
+    sql = text(
+        f"""
+        WITH deleted AS (
+            DELETE FROM transactions
+            WHERE id = ANY(ARRAY(
+                SELECT t.id FROM transactions t
+                WHERE {" AND ".join(filters)}
+                LIMIT :batch_rows
+            ))
+            RETURNING ingest_id
+        ),
+        forgotten AS (
+            UPDATE ingests SET content_sha256 = NULL
+            WHERE id IN (SELECT ingest_id FROM deleted) AND content_sha256 IS NOT NULL
+        )
+        SELECT count(*) FROM deleted
+        """
+    )
+    deleted = 0
+    while True:
+        with engine.begin() as conn:
+            count = conn.execute(sql, {**params, "batch_rows": batch_rows}).scalar_one()
+        deleted += count
+        if count < batch_rows:
+            return deleted
@@ -0,0 +1,70 @@
+import hashlib
+from typing import IO, Optional
+
+from sqlalchemy import text
+
+
+def file_sha256(fileobj: IO[bytes], block_size: int = 1 << 20) -> str:
+    """Return the SHA-256 of *fileobj*'s content and rewind it."""
+    digest = hashlib.sha256()
+    fileobj.seek(0)
+    for block in iter(lambda: fileobj.read(block_size), b""):
+        digest.update(block)
+    fileobj.seek(0)
+    return digest.hexdigest()
+
+
+def find_ingest(conn, content_sha256: str) -> Optional[dict]:
+    """Return the recorded ingest of a file with this content hash, if any."""
+    row = conn.execute(
+        text(
+            """
+            SELECT id, filename, row_count, inserted_rows, skipped_rows
+            FROM ingests
+            WHERE content_sha256 = :sha
+            """
+        ),
+        {"sha": content_sha256},
+    ).mappings().fetchone()
+    return dict(row) if row else None
+
+
+def start_ingest(conn, content_sha256: str, bank_id: int, filename: str) -> Optional[int]:
+    """Record a new ingest and return its id, or None if this content was already ingested.
+
+    A concurrent upload of the same file blocks on the UNIQUE hash until the
+    first one commits or rolls back.
+    """
+    return conn.execute(
+        text(
+            """
+            INSERT INTO ingests (content_sha256, bank_id, filename)
+            VALUES (:sha, :bank_id, :filename)
+            ON CONFLICT (content_sha256) DO NOTHING
+            RETURNING id
+            """
+        ),
+        {"sha": content_sha256, "bank_id": bank_id, "filename": filename},
+    ).scalar()
+
+
+def finish_ingest(conn, ingest_id: int, row_count: int, inserted_rows: int) -> None:
+    conn.execute(
+        text(
+            """
+            UPDATE ingests
+            SET row_count = :row_count,
+                inserted_rows = :inserted_rows,
+                skipped_rows = :row_count - :inserted_rows
+            WHERE id = :id
+            """
+        ),
+        {"id": ingest_id, "row_count": row_count, "inserted_rows": inserted_rows},
+    )
+
+
+def delete_ingest(conn, ingest_id: int) -> bool:
+    """Forget an ingest, so the same file can be uploaded again."""
+    return conn.execute(
+        text("DELETE FROM ingests WHERE id = :id"), {"id": ingest_id}
+    ).rowcount > 0
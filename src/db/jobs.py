@@ -0,0 +1,145 @@
+import json
+from typing import Optional
+
+from sqlalchemy import text
+
+JOB_COLUMNS = """
+    id, state, bank, filename, rows_processed, result, error,
+    created_at, started_at, updated_at, finished_at
+"""
+
+# Arbitrary first key of the pg_advisory_lock(class, job id) a worker holds
+# on its connection while it runs a job. The lock goes away with the
+# worker's session, so a running job whose lock is free was abandoned.
+_JOB_LOCK_CLASS = 7_200_312
+
+
+def create_job(conn, bank: str, filename: str, spool_path: str) -> int:
+    """Record a queued job for the file spooled at *spool_path* and return its id."""
+    return conn.execute(
+        text(
+            """
+            INSERT INTO ingest_jobs (bank, filename, spool_path)
+            VALUES (:bank, :filename, :spool_path)
+            RETURNING id
+            """
+        ),
+        {"bank": bank, "filename": filename, "spool_path": spool_path},
+    ).scalar_one()
+
+
+def claim_job(conn, job_id: int) -> Optional[dict]:
+    """Move a queued job to ``running`` and return it, or None if it is not queued.
+
+    The conditional UPDATE makes the claim atomic, so a job submitted twice
+    (e.g. re-queued at startup while already on the executor) runs once.
+    A claimed job is locked for the session of *conn* until
+    :func:`release_job`, so keep the connection open while the job runs.
+    """
+    locked = conn.execute(
+        text("SELECT pg_try_advisory_lock(:lock_class, :id)"),
+        {"lock_class": _JOB_LOCK_CLASS, "id": job_id},
+    ).scalar_one()
+    if not locked:
+        return None
+    row = conn.execute(
+        text(
+            """
+            UPDATE ingest_jobs
+            SET state = 'running', started_at = now(), updated_at = now()
+            WHERE id = :id AND state = 'queued'
+            RETURNING id, bank, filename, spool_path
+            """
+        ),
+        {"id": job_id},
+    ).mappings().fetchone()
+    if row is None:
+        release_job(conn, job_id)
+        return None
+    return dict(row)
+
+
+def release_job(conn, job_id: int) -> None:
+    """Drop the lock :func:`claim_job` took on *conn*'s session.
+
+    Session locks outlive transactions, so this must run before the
+    connection goes back to the pool.
+    """
+    conn.execute(
+        text("SELECT pg_advisory_unlock(:lock_class, :id)"),
+        {"lock_class": _JOB_LOCK_CLASS, "id": job_id},
+    )
+
+
+def report_progress(conn, job_id: int, rows_processed: int) -> None:
+    conn.execute(
+        text(
+            """
+            UPDATE ingest_jobs
+            SET rows_processed = :rows_processed, updated_at = now()
+            WHERE id = :id
+            """
+        ),
+        {"id": job_id, "rows_processed": rows_processed},
+    )
+
+
+def finish_job(
+    conn, job_id: int, result: Optional[dict] = None, error: Optional[str] = None
+) -> None:
+    """Mark the job ``succeeded`` with *result*, or ``failed`` with *error*."""
+    conn.execute(
+        text(
+            """
+            UPDATE ingest_jobs
+            SET state = :state, result = CAST(:result AS JSONB), error = :error,
+                updated_at = now(), finished_at = now()
+            WHERE id = :id
+            """
+        ),
+        {
+            "id": job_id,
+            "state": "failed" if error is not None else "succeeded",
+            "result": json.dumps(result) if result is not None else None,
+            "error": error,
+        },
+    )
+
+
+def requeue_interrupted_jobs(conn) -> list[int]:
+    """Return jobs abandoned while ``running`` to the queue.
+
+    A job counts as abandoned when no session holds its lock, i.e. the
+    process that claimed it is gone; jobs other live processes are running
+    keep their state. Only running jobs are tried for their lock, so a
+    claim in progress elsewhere is not disturbed. An abandoned ingest
+    transaction never committed, so rerunning it is safe. Returns the ids
+    of every queued job, oldest first.
+    """
+    conn.execute(
+        text(
+            """
+            WITH running AS MATERIALIZED (
+                SELECT id FROM ingest_jobs WHERE state = 'running'
+            )
+            UPDATE ingest_jobs
+            SET state = 'queued', rows_processed = 0, started_at = NULL, updated_at = now()
+            WHERE id IN (
+                SELECT id FROM running WHERE pg_try_advisory_xact_lock(:lock_class, id)
+            )
+            """
+        ),
+        {"lock_class": _JOB_LOCK_CLASS},
+    )
+    return list(
+        conn.execute(
+            text("SELECT id FROM ingest_jobs WHERE state = 'queued' ORDER BY id")
+        ).scalars()
+    )
+
+
+def get_job(conn, job_id: int) -> Optional[dict]:
+    row = conn.execute(
+        text(f"SELECT {JOB_COLUMNS} FROM ingest_jobs WHERE id = :id"), {"id": job_id}
+    ).mappings().fetchone()
+    return dict(row) if row else None
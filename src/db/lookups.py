@@ -0,0 +1,115 @@
+import threading
+from typing import Iterable
+
+from sqlalchemy import text
+
+
+class IdCache:
+    """Process-wide ``(category, sub_category) -> id`` and ``bank -> id`` maps.
+
+    Misses are resolved in one round trip with a multi-row
+    ``INSERT … ON CONFLICT DO NOTHING RETURNING`` plus a ``SELECT`` of the
+    rows that already existed. Resolution runs in its own short transaction,
+    so only committed ids are ever cached and concurrent uploads creating
+    the same category no longer trip the UNIQUE constraint.
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.categories: dict[tuple[str, str], int] = {}
+        self.banks: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def warm(self) -> None:
+        """Load every existing category and bank id."""
+        with self.engine.begin() as conn:
+            categories = conn.execute(
+                text("SELECT category, sub_category, id FROM categories")
+            ).fetchall()
+            banks = conn.execute(text("SELECT name, id FROM banks")).fetchall()
+        with self._lock:
+            self.categories.update({(row[0], row[1]): row[2] for row in categories})
+            self.banks.update({row[0]: row[1] for row in banks})
+
+    def clear(self) -> None:
+        with self._lock:
+            self.categories.clear()
+            self.banks.clear()
+
+    def category_ids(self, pairs: Iterable[tuple[str, str]]) -> dict[tuple[str, str], int]:
+        """Return ids for each ``(category, sub_category)`` pair, creating missing rows."""
+        pairs = set(pairs)
+        missing = [pair for pair in pairs if pair not in self.categories]
+        if missing:
+            resolved = self._upsert(
+                "categories", ("category", "sub_category"), missing
+            )
+            with self._lock:
+                self.categories.update(resolved)
+        return {pair: self.categories[pair] for pair in pairs}
+
+    def category_id(self, category: str, sub_category: str) -> int:
+        return self.category_ids([(category, sub_category)])[(category, sub_category)]
+
+    def bank_id(self, name: str, currency: str) -> int:
+        """Return the id for bank *name*, creating it with *currency* if needed."""
+        if name not in self.banks:
+            resolved = self._upsert("banks", ("name", "currency"), [(name, currency)])
+            with self._lock:
+                self.banks[name] = resolved[(name, currency)]
+        return self.banks[name]
+
+    def _upsert(
+        self, table: str, columns: tuple[str, str], rows: list[tuple[str, str]]
+    ) -> dict[tuple[str, str], int]:
+        """Insert *rows* into *table* if absent and return ``{row: id}``.
+
+        For ``banks`` only ``name`` is unique, so existing rows are matched on
+        the first column alone and keyed by the requested ``(name, currency)``.
+        """
+        first, second = columns
+        key_columns = columns if table == "categories" else (first,)
+        params: dict[str, str] = {}
+        values = []
+        for index, (first_value, second_value) in enumerate(rows):
+            params[f"a{index}"] = first_value
+            params[f"b{index}"] = second_value
+            values.append(f"(:a{index}, :b{index})")
+        join_on = " AND ".join(f"t.{column} = i.{column}" for column in key_columns)
+        upsert_sql = text(
+            f"""
+            WITH input ({first}, {second}) AS (VALUES {", ".join(values)}),
+            inserted AS (
+                INSERT INTO {table} ({first}, {second})
+                SELECT {first}, {second} FROM input
+                ON CONFLICT DO NOTHING
+                RETURNING id, {first}, {second}
+            )
+            SELECT i.{first}, i.{second}, ins.id
+            FROM input i
+            JOIN inserted ins ON {" AND ".join(f"ins.{column} = i.{column}" for column in key_columns)}
+            UNION ALL
+            SELECT i.{first}, i.{second}, t.id
+            FROM input i
+            JOIN {table} t ON {join_on}
+            """
+        )
+        with self.engine.begin() as conn:
+            resolved = {
+                (row[0], row[1]): row[2] for row in conn.execute(upsert_sql, params)
+            }
+            leftover = [row for row in rows if row not in resolved]
+            if leftover:
+                # Rows committed by a concurrent transaction after this
+                # statement's snapshot was taken: a fresh SELECT sees them.
+                select_sql = text(
+                    f"""
+                    SELECT i.{first}, i.{second}, t.id
+                    FROM (VALUES {", ".join(values)}) AS i ({first}, {second})
+                    JOIN {table} t ON {join_on}
+                    """
+                )
+                resolved.update(
+                    {(row[0], row[1]): row[2] for row in conn.execute(select_sql, params)}
+                )
+        return resolved
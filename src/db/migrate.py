@@ -0,0 +1,62 @@
+import logging
+import re
+from pathlib import Path
+
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_DIR = Path(__file__).parent / "migrations"
+
+# Arbitrary key for pg_advisory_xact_lock, so concurrent workers starting up
+# apply migrations one at a time.
+_MIGRATION_LOCK_KEY = 7_200_310
+
+
+def available_migrations() -> list[tuple[int, str, Path]]:
+    """Return ``(version, name, path)`` for every ``NNNN_name.sql`` file, in order."""
+    migrations = []
+    for path in MIGRATIONS_DIR.glob("*.sql"):
+        match = re.match(r"(\d+)_(.+)\.sql$", path.name)
+        if match:
+            migrations.append((int(match.group(1)), match.group(2), path))
+    return sorted(migrations)
+
+
+def run_migrations(engine) -> list[int]:
+    """Apply pending migrations in version order and return the versions applied.
+
+    Applied versions are recorded in ``schema_migrations``. Each migration
+    runs in its own transaction together with its bookkeeping row.
+    """
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                """
+                CREATE TABLE IF NOT EXISTS schema_migrations (
+                    version    INTEGER PRIMARY KEY,
+                    name       TEXT NOT NULL,
+                    applied_at TIMESTAMPTZ NOT NULL DEFAULT now()
+                )
+                """
+            )
+        )
+
+    applied: list[int] = []
+    for version, name, path in available_migrations():
+        with engine.begin() as conn:
+            conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _MIGRATION_LOCK_KEY})
+            done = conn.execute(
+                text("SELECT 1 FROM schema_migrations WHERE version = :version"),
+                {"version": version},
+            ).fetchone()
+            if done:
+                continue
+            logger.info("Applying migration %04d_%s", version, name)
+            conn.exec_driver_sql(path.read_text())
+            conn.execute(
+                text("INSERT INTO schema_migrations (version, name) VALUES (:version, :name)"),
+                {"version": version, "name": name},
+            )
+        applied.append(version)
+    return applied
@@ -0,0 +1,15 @@
+-- Indexes for the transactions read paths.
+
+-- Date-range filters and the (date, id) ordering/keyset of GET /transactions.
+-- The included columns let the summary aggregate a date range with an
+-- index-only scan.
+CREATE INDEX IF NOT EXISTS transactions_date_id_idx
+    ON transactions (date, id)
+    INCLUDE (sub_category_id, withdrawal, deposit);
+
+-- Joins and filters on category and bank.
+CREATE INDEX IF NOT EXISTS transactions_sub_category_id_idx
+    ON transactions (sub_category_id);
+
+CREATE INDEX IF NOT EXISTS transactions_bank_id_idx
+    ON transactions (bank_id);
@@ -0,0 +1,81 @@
+-- Daily totals per (date, bank, sub-category), read by GET /transactions/summary.
+-- Kept in sync by statement-level triggers on transactions, so every write
+-- path (COPY ingest, PATCH, DELETE, Metabase edits) updates it set-wise.
+-- TRUNCATE does not fire these triggers; run rebuild_rollups() after one.
+
+CREATE TABLE IF NOT EXISTS transaction_daily_rollups (
+    date            DATE,
+    bank_id         INTEGER,
+    sub_category_id INTEGER,
+    withdrawal      NUMERIC NOT NULL DEFAULT 0,
+    deposit         NUMERIC NOT NULL DEFAULT 0,
+    row_count       BIGINT NOT NULL DEFAULT 0,
+    UNIQUE NULLS NOT DISTINCT (date, bank_id, sub_category_id)
+);
+
+CREATE OR REPLACE FUNCTION transactions_rollup_add_new() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO transaction_daily_rollups AS r
+        (date, bank_id, sub_category_id, withdrawal, deposit, row_count)
+    SELECT date, bank_id, sub_category_id,
+           COALESCE(SUM(withdrawal), 0), COALESCE(SUM(deposit), 0), COUNT(*)
+    FROM new_rows
+    GROUP BY date, bank_id, sub_category_id
+    ORDER BY date, bank_id, sub_category_id
+    ON CONFLICT (date, bank_id, sub_category_id) DO UPDATE
+    SET withdrawal = r.withdrawal + EXCLUDED.withdrawal,
+        deposit    = r.deposit + EXCLUDED.deposit,
+        row_count  = r.row_count + EXCLUDED.row_count;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION transactions_rollup_remove_old() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO transaction_daily_rollups AS r
+        (date, bank_id, sub_category_id, withdrawal, deposit, row_count)
+    SELECT date, bank_id, sub_category_id,
+           -COALESCE(SUM(withdrawal), 0), -COALESCE(SUM(deposit), 0), -COUNT(*)
+    FROM old_rows
+    GROUP BY date, bank_id, sub_category_id
+    ORDER BY date, bank_id, sub_category_id
+    ON CONFLICT (date, bank_id, sub_category_id) DO UPDATE
+    SET withdrawal = r.withdrawal + EXCLUDED.withdrawal,
+        deposit    = r.deposit + EXCLUDED.deposit,
+        row_count  = r.row_count + EXCLUDED.row_count;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS transactions_rollup_insert ON transactions;
+CREATE TRIGGER transactions_rollup_insert
+    AFTER INSERT ON transactions
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION transactions_rollup_add_new();
+
+DROP TRIGGER IF EXISTS transactions_rollup_update_old ON transactions;
+CREATE TRIGGER transactions_rollup_update_old
+    AFTER UPDATE ON transactions
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION transactions_rollup_remove_old();
+
+DROP TRIGGER IF EXISTS transactions_rollup_update_new ON transactions;
+CREATE TRIGGER transactions_rollup_update_new
+    AFTER UPDATE ON transactions
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION transactions_rollup_add_new();
+
+DROP TRIGGER IF EXISTS transactions_rollup_delete ON transactions;
+CREATE TRIGGER transactions_rollup_delete
+    AFTER DELETE ON transactions
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION transactions_rollup_remove_old();
+
+-- Backfill from rows ingested before this migration.
+TRUNCATE transaction_daily_rollups;
+INSERT INTO transaction_daily_rollups
+    (date, bank_id, sub_category_id, withdrawal, deposit, row_count)
+SELECT date, bank_id, sub_category_id,
+       COALESCE(SUM(withdrawal), 0), COALESCE(SUM(deposit), 0), COUNT(*)
+FROM transactions
+GROUP BY date, bank_id, sub_category_id;
@@ -0,0 +1,22 @@
+-- Idempotent re-uploads.
+
+-- One row per uploaded file; an identical file (same SHA-256) is skipped.
+CREATE TABLE IF NOT EXISTS ingests (
+    id             SERIAL PRIMARY KEY,
+    content_sha256 TEXT NOT NULL UNIQUE,
+    filename       TEXT,
+    bank_id        INTEGER REFERENCES banks(id),
+    row_count      INTEGER,
+    inserted_rows  INTEGER,
+    skipped_rows   INTEGER,
+    created_at     TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+-- Per-row fingerprint of (bank, date, merchant key, amounts, occurrence).
+-- Rows ingested before this migration keep a NULL fingerprint.
+-- The fingerprint already encodes the date; leading with it keeps the
+-- unique index valid should transactions be partitioned by date.
+ALTER TABLE transactions ADD COLUMN IF NOT EXISTS fingerprint TEXT;
+
+CREATE UNIQUE INDEX IF NOT EXISTS transactions_fingerprint_idx
+    ON transactions (date, fingerprint);
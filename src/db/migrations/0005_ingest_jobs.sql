@@ -0,0 +1,22 @@
+-- Background ingestion jobs.
+
+-- One row per upload submitted with async=true. The uploaded file is
+-- spooled to spool_path until a worker has processed it.
+CREATE TABLE IF NOT EXISTS ingest_jobs (
+    id             SERIAL PRIMARY KEY,
+    state          TEXT NOT NULL DEFAULT 'queued'
+                   CHECK (state IN ('queued', 'running', 'succeeded', 'failed')),
+    bank           TEXT NOT NULL,
+    filename       TEXT,
+    spool_path     TEXT NOT NULL,
+    rows_processed BIGINT NOT NULL DEFAULT 0,
+    result         JSONB,
+    error          TEXT,
+    created_at     TIMESTAMPTZ NOT NULL DEFAULT now(),
+    started_at     TIMESTAMPTZ,
+    updated_at     TIMESTAMPTZ NOT NULL DEFAULT now(),
+    finished_at    TIMESTAMPTZ
+);
+
+CREATE INDEX IF NOT EXISTS ingest_jobs_pending_idx
+    ON ingest_jobs (id) WHERE state IN ('queued', 'running');
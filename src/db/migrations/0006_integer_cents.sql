@@ -0,0 +1,62 @@
+-- Store amounts as integer minor units (cents, pence) instead of NUMERIC.
+-- Renaming the columns makes the unit explicit to other readers (Metabase).
+
+ALTER TABLE transactions RENAME COLUMN withdrawal TO withdrawal_cents;
+ALTER TABLE transactions RENAME COLUMN deposit TO deposit_cents;
+ALTER TABLE transactions
+    ALTER COLUMN withdrawal_cents TYPE BIGINT USING round(withdrawal_cents * 100),
+    ALTER COLUMN deposit_cents TYPE BIGINT USING round(deposit_cents * 100);
+
+ALTER TABLE transaction_daily_rollups RENAME COLUMN withdrawal TO withdrawal_cents;
+ALTER TABLE transaction_daily_rollups RENAME COLUMN deposit TO deposit_cents;
+ALTER TABLE transaction_daily_rollups
+    ALTER COLUMN withdrawal_cents TYPE BIGINT USING round(withdrawal_cents * 100),
+    ALTER COLUMN deposit_cents TYPE BIGINT USING round(deposit_cents * 100);
+
+-- SUM(bigint) returns NUMERIC; cast back so the rollup stays integer.
+CREATE OR REPLACE FUNCTION transactions_rollup_add_new() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO transaction_daily_rollups AS r
+        (date, bank_id, sub_category_id, withdrawal_cents, deposit_cents, row_count)
+    SELECT date, bank_id, sub_category_id,
+           COALESCE(SUM(withdrawal_cents), 0)::bigint,
+           COALESCE(SUM(deposit_cents), 0)::bigint,
+           COUNT(*)
+    FROM new_rows
+    GROUP BY date, bank_id, sub_category_id
+    ORDER BY date, bank_id, sub_category_id
+    ON CONFLICT (date, bank_id, sub_category_id) DO UPDATE
+    SET withdrawal_cents = r.withdrawal_cents + EXCLUDED.withdrawal_cents,
+        deposit_cents    = r.deposit_cents + EXCLUDED.deposit_cents,
+        row_count        = r.row_count + EXCLUDED.row_count;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION transactions_rollup_remove_old() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO transaction_daily_rollups AS r
+        (date, bank_id, sub_category_id, withdrawal_cents, deposit_cents, row_count)
+    SELECT date, bank_id, sub_category_id,
+           -COALESCE(SUM(withdrawal_cents), 0)::bigint,
+           -COALESCE(SUM(deposit_cents), 0)::bigint,
+           -COUNT(*)
+    FROM old_rows
+    GROUP BY date, bank_id, sub_category_id
+    ORDER BY date, bank_id, sub_category_id
+    ON CONFLICT (date, bank_id, sub_category_id) DO UPDATE
+    SET withdrawal_cents = r.withdrawal_cents + EXCLUDED.withdrawal_cents,
+        deposit_cents    = r.deposit_cents + EXCLUDED.deposit_cents,
+        row_count        = r.row_count + EXCLUDED.row_count;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Re-sum from the converted rows rather than rounding the old sums.
+TRUNCATE transaction_daily_rollups;
+INSERT INTO transaction_daily_rollups
+    (date, bank_id, sub_category_id, withdrawal_cents, deposit_cents, row_count)
+SELECT date, bank_id, sub_category_id,
+       COALESCE(SUM(withdrawal_cents), 0)::bigint, COALESCE(SUM(deposit_cents), 0)::bigint, COUNT(*)
+FROM transactions
+GROUP BY date, bank_id, sub_category_id;
@@ -0,0 +1,45 @@
+-- Keyword categorization rules, editable at runtime.
+
+-- One row per rule. Rules are tried in (priority, id) order and the first
+-- one with a keyword found in the merchant key wins. Keywords are regular
+-- expression fragments, matched case-insensitively.
+CREATE TABLE IF NOT EXISTS category_rules (
+    id           SERIAL PRIMARY KEY,
+    priority     INTEGER NOT NULL,
+    category     TEXT NOT NULL,
+    sub_category TEXT NOT NULL DEFAULT '',
+    keywords     TEXT[] NOT NULL,
+    created_at   TIMESTAMPTZ NOT NULL DEFAULT now(),
+    updated_at   TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS category_rules_priority_idx ON category_rules (priority, id);
+
+-- Single-row counter bumped by every change to the rules.
+-- API processes poll it to know when to rebuild their compiled matcher;
+-- version 0 means the rules were never seeded.
+CREATE TABLE IF NOT EXISTS category_rules_version (
+    singleton  BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (singleton),
+    version    BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+INSERT INTO category_rules_version (singleton) VALUES (TRUE) ON CONFLICT DO NOTHING;
+
+CREATE OR REPLACE FUNCTION bump_category_rules_version() RETURNS trigger AS $$
+BEGIN
+    UPDATE category_rules_version SET version = version + 1, updated_at = now();
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Per row, so an UPDATE or DELETE matching nothing leaves the version alone.
+DROP TRIGGER IF EXISTS category_rules_version_bump ON category_rules;
+CREATE TRIGGER category_rules_version_bump
+    AFTER INSERT OR UPDATE OR DELETE ON category_rules
+    FOR EACH ROW EXECUTE FUNCTION bump_category_rules_version();
+
+DROP TRIGGER IF EXISTS category_rules_version_truncate ON category_rules;
+CREATE TRIGGER category_rules_version_truncate
+    AFTER TRUNCATE ON category_rules
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_category_rules_version();
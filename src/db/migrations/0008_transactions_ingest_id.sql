@@ -0,0 +1,7 @@
+-- Link each transaction to the upload that inserted it, so a bad upload
+-- can be deleted as a batch. Rows ingested before this migration keep a
+-- NULL ingest_id.
+ALTER TABLE transactions
+    ADD COLUMN IF NOT EXISTS ingest_id INTEGER REFERENCES ingests(id) ON DELETE SET NULL;
+
+CREATE INDEX IF NOT EXISTS transactions_ingest_id_idx ON transactions (ingest_id);
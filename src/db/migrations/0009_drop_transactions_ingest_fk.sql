@@ -0,0 +1,9 @@
+-- Drop the foreign key from transactions.ingest_id to ingests.
+--
+-- Attaching a partition (see src/db/partitions.py) clones the parent's
+-- foreign keys, which locks each referenced table in SHARE ROW EXCLUSIVE
+-- mode. An upload creates its ingests row in the same transaction that
+-- later needs new partitions, so the key would make uploads into new
+-- months wait on themselves. Deleting an upload removes its rows before
+-- the ingests row, so nothing relies on ON DELETE SET NULL.
+ALTER TABLE transactions DROP CONSTRAINT IF EXISTS transactions_ingest_id_fkey;
@@ -0,0 +1,9 @@
+-- Drop the INCLUDE payload of transactions_date_id_idx.
+--
+-- The columns were included so the summary could aggregate a date range
+-- with an index-only scan. The summary and timeseries now read
+-- transaction_daily_rollups, so nothing reads them from the index, while
+-- every COPY still has to write them. Listing and keyset paging only need
+-- (date, id).
+DROP INDEX IF EXISTS transactions_date_id_idx;
+CREATE INDEX transactions_date_id_idx ON transactions (date, id);
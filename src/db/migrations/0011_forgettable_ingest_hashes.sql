@@ -0,0 +1,8 @@
+-- Let an ingest forget its content hash.
+--
+-- Deleting some of an upload's rows clears the hash of its ingests row, so
+-- uploading the same file again is no longer skipped as a duplicate and
+-- the per-row fingerprints restore exactly the rows that were deleted. The
+-- row itself stays, so the upload's remaining rows can still be deleted by
+-- ingest_id. UNIQUE allows any number of NULLs.
+ALTER TABLE ingests ALTER COLUMN content_sha256 DROP NOT NULL;
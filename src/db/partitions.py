@@ -0,0 +1,303 @@
+"""Optional monthly range partitioning of ``transactions`` by ``date``.
+
+The flat table stays the default. ``python -m src.db.partitions convert``
+rebuilds it as a partitioned table with one partition per month; from then
+on uploads create the partitions they need (see :class:`TransactionPartitions`)
+and ``python -m src.db.partitions detach YYYY-MM`` takes an old month out.
+"""
+import argparse
+import logging
+import re
+import sys
+import threading
+from datetime import date
+from typing import Optional
+
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+PARTITION_PATTERN = re.compile(r"^transactions_y(\d{4})m(\d{2})$")
+
+# Arbitrary key for pg_advisory_xact_lock, so concurrent uploads create a
+# missing partition once.
+_PARTITION_LOCK_KEY = 7_200_311
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def next_month(month: date) -> date:
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+def months_between(first: date, last: date) -> list[date]:
+    """Return the first day of every month from *first*'s to *last*'s, inclusive."""
+    months = []
+    month = month_start(first)
+    while month <= last:
+        months.append(month)
+        month = next_month(month)
+    return months
+
+
+def partition_name(month: date) -> str:
+    return f"transactions_y{month.year:04d}m{month.month:02d}"
+
+
+def is_partitioned(conn) -> bool:
+    return conn.execute(
+        text(
+            """
+            SELECT EXISTS (
+                SELECT 1 FROM pg_partitioned_table WHERE partrelid = 'transactions'::regclass
+            )
+            """
+        )
+    ).scalar_one()
+
+
+def partition_months(conn) -> set[date]:
+    """Return the months that have a partition attached to ``transactions``."""
+    names = conn.execute(
+        text(
+            """
+            SELECT c.relname
+            FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = 'transactions'::regclass
+            """
+        )
+    ).scalars()
+    months = set()
+    for name in names:
+        match = PARTITION_PATTERN.match(name)
+        if match:
+            months.add(date(int(match.group(1)), int(match.group(2)), 1))
+    return months
+
+
+def create_partitions(conn, months: list[date]) -> list[str]:
+    """Create and attach the partitions of *months* that do not exist yet; return their names.
+
+    Each partition is created as a standalone table and then attached.
+    ``CREATE TABLE … PARTITION OF`` would need an ACCESS EXCLUSIVE lock on
+    ``transactions``, and so would wait for every open upload. ``ATTACH
+    PARTITION`` only takes SHARE UPDATE EXCLUSIVE, which does not conflict
+    with inserts, and an upload already in progress sees the new partition
+    from its next statement.
+    """
+    conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _PARTITION_LOCK_KEY})
+    existing = partition_months(conn)
+    created = []
+    for month in sorted(set(months) - existing):
+        name = partition_name(month)
+        start, end = month.isoformat(), next_month(month).isoformat()
+        conn.execute(
+            text(f"CREATE TABLE {name} (LIKE transactions INCLUDING DEFAULTS INCLUDING CONSTRAINTS)")
+        )
+        conn.execute(
+            text(
+                f"ALTER TABLE transactions ATTACH PARTITION {name} "
+                f"FOR VALUES FROM ('{start}') TO ('{end}')"
+            )
+        )
+        created.append(name)
+    return created
+
+
+class TransactionPartitions:
+    """Create missing monthly partitions before rows are written to them.
+
+    Whether ``transactions`` is partitioned, and which months exist, is read
+    once per process and then kept up to date from the partitions this
+    process creates. Converting a running database therefore needs an API
+    restart. On the flat layout :meth:`ensure` is a no-op.
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.partitioned: Optional[bool] = None
+        self.months: set[date] = set()
+        self._lock = threading.Lock()
+
+    def refresh(self) -> None:
+        with self.engine.begin() as conn:
+            partitioned = is_partitioned(conn)
+            months = partition_months(conn) if partitioned else set()
+        with self._lock:
+            self.partitioned = partitioned
+            self.months = months
+
+    def ensure(self, first: date, last: date) -> None:
+        """Make sure a partition exists for every month from *first* to *last*.
+
+        Runs in its own short transaction, so it can be called while an
+        upload's transaction is open.
+        """
+        if self.partitioned is None:
+            self.refresh()
+        if not self.partitioned:
+            return
+        needed = months_between(first, last)
+        if self.months.issuperset(needed):
+            return
+        with self.engine.begin() as conn:
+            created = create_partitions(conn, needed)
+        if created:
+            logger.info("Created transaction partitions %s", ", ".join(created))
+        with self._lock:
+            self.months.update(needed)
+
+
+def convert_to_partitioned(conn) -> int:
+    """Rebuild the flat ``transactions`` table as a monthly partitioned table.
+
+    Runs in the caller's transaction and holds an ACCESS EXCLUSIVE lock on
+    ``transactions`` while every row is copied, so run it in a maintenance
+    window. Indexes, foreign keys and the rollup triggers are recreated from
+    their current definitions. The primary key becomes ``(id, date)``,
+    because a partitioned table's unique keys must include the partition
+    key, so ``date`` must not be NULL. ``transaction_daily_rollups`` is
+    left as it is: the copy runs before the triggers exist. Returns the
+    number of partitions created.
+    """
+    if is_partitioned(conn):
+        raise ValueError("transactions is already partitioned")
+    conn.execute(text("LOCK TABLE transactions IN ACCESS EXCLUSIVE MODE"))
+    undated = conn.execute(text("SELECT count(*) FROM transactions WHERE date IS NULL")).scalar_one()
+    if undated:
+        raise ValueError(f"{undated} transaction(s) have no date; fix or delete them first")
+
+    indexes = conn.execute(
+        text(
+            """
+            SELECT c.relname, pg_get_indexdef(i.indexrelid), i.indisprimary
+            FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid
+            WHERE i.indrelid = 'transactions'::regclass
+            """
+        )
+    ).fetchall()
+    foreign_keys = conn.execute(
+        text(
+            """
+            SELECT conname, pg_get_constraintdef(oid)
+            FROM pg_constraint
+            WHERE conrelid = 'transactions'::regclass AND contype = 'f'
+            """
+        )
+    ).fetchall()
+    triggers = conn.execute(
+        text(
+            """
+            SELECT pg_get_triggerdef(oid)
+            FROM pg_trigger
+            WHERE tgrelid = 'transactions'::regclass AND NOT tgisinternal
+            """
+        )
+    ).scalars().all()
+    sequence = conn.execute(
+        text("SELECT pg_get_serial_sequence('transactions', 'id')")
+    ).scalar_one()
+    first, last = conn.execute(text("SELECT min(date), max(date) FROM transactions")).one()
+
+    # Move the flat table and its index names out of the way.
+    conn.execute(text("ALTER TABLE transactions RENAME TO transactions_flat"))
+    for name, _, _ in indexes:
+        conn.execute(text(f"ALTER INDEX {name} RENAME TO {name}_flat"))
+    if sequence:
+        conn.execute(text(f"ALTER SEQUENCE {sequence} OWNED BY NONE"))
+
+    conn.execute(
+        text(
+            """
+            CREATE TABLE transactions (LIKE transactions_flat INCLUDING DEFAULTS)
+            PARTITION BY RANGE (date)
+            """
+        )
+    )
+    conn.execute(text("ALTER TABLE transactions ALTER COLUMN date SET NOT NULL"))
+    conn.execute(
+        text("ALTER TABLE transactions ADD CONSTRAINT transactions_pkey PRIMARY KEY (id, date)")
+    )
+    months = months_between(first, last) if first is not None else []
+    for month in months:
+        conn.execute(
+            text(
+                f"CREATE TABLE {partition_name(month)} PARTITION OF transactions "
+                f"FOR VALUES FROM ('{month.isoformat()}') TO ('{next_month(month).isoformat()}')"
+            )
+        )
+    conn.execute(text("INSERT INTO transactions SELECT * FROM transactions_flat"))
+
+    # Definitions captured above still name "transactions", now the new table.
+    # Sent verbatim: they are catalog output, not templates with parameters.
+    for _, definition, primary in indexes:
+        if not primary:
+            conn.exec_driver_sql(definition)
+    for name, definition in foreign_keys:
+        conn.exec_driver_sql(f"ALTER TABLE transactions ADD CONSTRAINT {name} {definition}")
+    for definition in triggers:
+        conn.exec_driver_sql(definition)
+
+    conn.execute(text("DROP TABLE transactions_flat"))
+    if sequence:
+        conn.execute(text(f"ALTER SEQUENCE {sequence} OWNED BY transactions.id"))
+    return len(months)
+
+
+def detach_partition(conn, month: date) -> str:
+    """Detach *month*'s partition from ``transactions`` and return its table name.
+
+    The table is kept, so it can be archived or dropped later. Its rows are
+    taken out of ``transaction_daily_rollups`` in the same transaction;
+    rollups are keyed by date, so that is exactly the month's rows.
+    """
+    month = month_start(month)
+    name = partition_name(month)
+    if month not in partition_months(conn):
+        raise ValueError(f"No partition {name}")
+    conn.execute(
+        text("DELETE FROM transaction_daily_rollups WHERE date >= :start AND date < :end"),
+        {"start": month, "end": next_month(month)},
+    )
+    conn.execute(text(f"ALTER TABLE transactions DETACH PARTITION {name}"))
+    return name
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.db.partitions",
+        description="Manage monthly partitioning of the transactions table.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("convert", help="Rebuild the flat table as a monthly partitioned one")
+    commands.add_parser("list", help="List the monthly partitions")
+    detach = commands.add_parser("detach", help="Detach one month's partition")
+    detach.add_argument("month", help="Month to detach, as YYYY-MM")
+    args = parser.parse_args(argv)
+
+    # Imported here so that only the command line pulls in the app.
+    from ..main import engine
+
+    try:
+        with engine.begin() as conn:
+            if args.command == "convert":
+                count = convert_to_partitioned(conn)
+                print(f"✔ transactions is now partitioned by month ({count} partition(s))")
+            elif args.command == "list":
+                if not is_partitioned(conn):
+                    print("transactions is not partitioned")
+                for month in sorted(partition_months(conn)):
+                    print(partition_name(month))
+            else:
+                name = detach_partition(conn, date.fromisoformat(f"{args.month}-01"))
+                print(f"✔ Detached {name}; drop or archive it when no longer needed")
+    except ValueError as exc:
+        print(f"✗ {exc}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
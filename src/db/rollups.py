@@ -0,0 +1,100 @@
+"""Consistency checks for ``transaction_daily_rollups``.
+
+Triggers keep the rollup in step with ``transactions``.
+``python -m src.db.rollups check`` compares it against a full recompute and
+``python -m src.db.rollups rebuild`` recomputes it, e.g. after a
+``TRUNCATE``, which fires no row triggers.
+"""
+import argparse
+import sys
+from typing import Optional
+
+from sqlalchemy import text
+
+_RECOMPUTE_SQL = """
+    SELECT date, bank_id, sub_category_id,
+           COALESCE(SUM(withdrawal_cents), 0)::bigint AS withdrawal_cents,
+           COALESCE(SUM(deposit_cents), 0)::bigint AS deposit_cents,
+           COUNT(*) AS row_count
+    FROM transactions
+    GROUP BY date, bank_id, sub_category_id
+"""
+
+
+def rollup_mismatches(conn) -> list[dict]:
+    """Compare ``transaction_daily_rollups`` against a full recompute.
+
+    Returns the rows present on only one side, tagged ``source`` =
+    ``"expected"`` (recomputed from ``transactions``) or ``"stored"`` (the
+    rollup); empty when the rollup is consistent. Keys whose stored count
+    dropped to zero are treated as absent.
+    """
+    sql = text(
+        f"""
+        WITH expected AS ({_RECOMPUTE_SQL}),
+        stored AS (
+            SELECT date, bank_id, sub_category_id, withdrawal_cents, deposit_cents, row_count
+            FROM transaction_daily_rollups
+            WHERE row_count <> 0
+        )
+        SELECT 'expected' AS source, * FROM (SELECT * FROM expected EXCEPT SELECT * FROM stored) e
+        UNION ALL
+        SELECT 'stored' AS source, * FROM (SELECT * FROM stored EXCEPT SELECT * FROM expected) s
+        ORDER BY date, bank_id, sub_category_id, source
+        """
+    )
+    return [dict(row) for row in conn.execute(sql).mappings()]
+
+
+def rebuild_rollups(conn) -> None:
+    """Recompute ``transaction_daily_rollups`` from scratch."""
+    conn.execute(text("LOCK TABLE transactions IN SHARE MODE"))
+    conn.execute(text("TRUNCATE transaction_daily_rollups"))
+    conn.execute(
+        text(
+            f"""
+            INSERT INTO transaction_daily_rollups
+                (date, bank_id, sub_category_id, withdrawal_cents, deposit_cents, row_count)
+            {_RECOMPUTE_SQL}
+            """
+        )
+    )
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.db.rollups",
+        description="Check or rebuild the transaction_daily_rollups table.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("check", help="List rollup rows that differ from a full recompute")
+    commands.add_parser("rebuild", help="Recompute the rollups from transactions")
+    args = parser.parse_args(argv)
+
+    # Imported here so that only the command line pulls in the app.
+    from ..main import engine
+
+    with engine.begin() as conn:
+        if args.command == "rebuild":
+            rebuild_rollups(conn)
+            print("✔ Rebuilt transaction_daily_rollups")
+            return 0
+        mismatches = rollup_mismatches(conn)
+    for row in mismatches:
+        print(
+            f"{row['source']:8} {row['date']} bank={row['bank_id']} "
+            f"sub_category={row['sub_category_id']} withdrawal_cents={row['withdrawal_cents']} "
+            f"deposit_cents={row['deposit_cents']} rows={row['row_count']}"
+        )
+    if mismatches:
+        print(
+            f"✗ {len(mismatches)} rollup row(s) differ; run python -m src.db.rollups rebuild",
+            file=sys.stderr,
+        )
+        return 1
+    print("✔ transaction_daily_rollups matches transactions")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
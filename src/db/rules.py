@@ -0,0 +1,141 @@
+from typing import Iterable, Optional
+
+from sqlalchemy import text
+
+from ..categorizer import label_value
+
+RULE_COLUMNS = "id, priority, category, sub_category, keywords, created_at, updated_at"
+
+# Gap between the priorities given to seeded rules, leaving room to insert
+# new rules between them.
+SEED_PRIORITY_STEP = 10
+
+
+def rules_version(conn) -> int:
+    return conn.execute(text("SELECT version FROM category_rules_version")).scalar_one()
+
+
+def load_rules(conn) -> tuple[int, list[dict]]:
+    """Return the rules version and every rule in match order.
+
+    Both are read by one statement, so the rules are exactly those of the
+    returned version even while another transaction is editing them.
+    """
+    rows = conn.execute(
+        text(
+            """
+            SELECT v.version, r.id, r.priority, r.category, r.sub_category, r.keywords,
+                   r.created_at, r.updated_at
+            FROM category_rules_version v
+            LEFT JOIN category_rules r ON TRUE
+            ORDER BY r.priority, r.id
+            """
+        )
+    ).mappings().all()
+    version = rows[0]["version"]
+    rules = [
+        {key: value for key, value in row.items() if key != "version"}
+        for row in rows
+        if row["id"] is not None
+    ]
+    return version, rules
+
+
+def get_rule(conn, rule_id: int) -> Optional[dict]:
+    row = conn.execute(
+        text(f"SELECT {RULE_COLUMNS} FROM category_rules WHERE id = :id"), {"id": rule_id}
+    ).mappings().fetchone()
+    return dict(row) if row else None
+
+
+def create_rule(
+    conn, category: str, sub_category: str, keywords: list[str], priority: Optional[int] = None
+) -> dict:
+    """Insert a rule and return it; without *priority* it is tried after every other rule."""
+    row = conn.execute(
+        text(
+            f"""
+            INSERT INTO category_rules (priority, category, sub_category, keywords)
+            VALUES (
+                COALESCE(
+                    :priority,
+                    (SELECT COALESCE(MAX(priority), 0) + {SEED_PRIORITY_STEP} FROM category_rules)
+                ),
+                :category, :sub_category, :keywords
+            )
+            RETURNING {RULE_COLUMNS}
+            """
+        ),
+        {
+            "priority": priority,
+            "category": category,
+            "sub_category": sub_category,
+            "keywords": list(keywords),
+        },
+    ).mappings().one()
+    return dict(row)
+
+
+def update_rule(conn, rule_id: int, **changes) -> Optional[dict]:
+    """Apply *changes* (priority, category, sub_category, keywords) and return the rule.
+
+    Returns None if there is no rule *rule_id*.
+    """
+    allowed = {"priority", "category", "sub_category", "keywords"}
+    changes = {key: value for key, value in changes.items() if key in allowed and value is not None}
+    if not changes:
+        return get_rule(conn, rule_id)
+    assignments = ", ".join(f"{key} = :{key}" for key in changes)
+    row = conn.execute(
+        text(
+            f"""
+            UPDATE category_rules SET {assignments}, updated_at = now()
+            WHERE id = :id
+            RETURNING {RULE_COLUMNS}
+            """
+        ),
+        {"id": rule_id, **changes},
+    ).mappings().fetchone()
+    return dict(row) if row else None
+
+
+def delete_rule(conn, rule_id: int) -> bool:
+    return conn.execute(
+        text("DELETE FROM category_rules WHERE id = :id"), {"id": rule_id}
+    ).rowcount > 0
+
+
+def seed_rules(conn, keyword_maps: Iterable[dict]) -> bool:
+    """Copy *keyword_maps* into an empty ``category_rules`` table, once.
+
+    Seeding only happens while the rules version is still 0, so deleting
+    every rule later does not bring the defaults back. The version row is
+    locked first, so concurrent workers starting up seed at most once.
+    Returns whether rules were inserted.
+    """
+    version = conn.execute(
+        text("SELECT version FROM category_rules_version FOR UPDATE")
+    ).scalar_one()
+    if version:
+        return False
+    rows = [
+        {
+            "priority": (index + 1) * SEED_PRIORITY_STEP,
+            "category": label_value(obj["category"]),
+            "sub_category": label_value(obj["sub_category"]),
+            "keywords": list(obj["keywords"]),
+        }
+        for index, obj in enumerate(keyword_maps)
+    ]
+    if not rows:
+        return False
+    conn.execute(
+        text(
+            """
+            INSERT INTO category_rules (priority, category, sub_category, keywords)
+            VALUES (:priority, :category, :sub_category, :keywords)
+            """
+        ),
+        rows,
+    )
+    return True
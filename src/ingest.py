@@ -0,0 +1,285 @@
+import csv
+import os
+from dataclasses import dataclass
+from typing import IO, Iterator, Optional, Union
+
+import pandas as pd
+
+from .categorizer import CachedCategorizer, CategorizerSnapshot
+from .constants.bank import Bank, Currency, LloydsColumns, SchwabColumns
+from .metrics import StageTimings
+
+try:  # optional: a faster, GIL-releasing CSV parser
+    import pyarrow as pa
+    from pyarrow import compute as pa_compute
+    from pyarrow import csv as pa_csv
+except ImportError:  # pragma: no cover - depends on the environment
+    pa = pa_compute = pa_csv = None
+
+
+class MalformedCSVError(ValueError):
+    """The upload could not be parsed as CSV."""
+
+
+class InvalidStatementError(ValueError):
+    """The CSV parsed but does not look like a statement for the given bank."""
+
+
+@dataclass(frozen=True)
+class ParsePlan:
+    """How to read one bank's CSV export: the columns we keep and their formats."""
+
+    columns: type
+    currency: str
+    date_format: str
+
+    @property
+    def usecols(self) -> list[str]:
+        return [column.value for column in self.columns]
+
+    @property
+    def dtypes(self) -> dict[str, type]:
+        # Every kept column is cleaned up in prepare_transactions, so read
+        # them as plain strings and skip pandas' type inference.
+        return {column: str for column in self.usecols}
+
+
+PARSE_PLANS = {
+    Bank.SCHWAB: ParsePlan(SchwabColumns, Currency.USD.value, "%m/%d/%Y"),
+    Bank.LLOYDS: ParsePlan(LloydsColumns, Currency.GBP.value, "%d/%m/%Y"),
+}
+
+# Upper bound on the header line read when sniffing a file
+_MAX_HEADER_BYTES = 64 * 1024
+# Bytes pyarrow parses per block when streaming
+_ARROW_BLOCK_BYTES = 1 << 20
+
+
+def bank_profile(bank: Bank) -> tuple[type, str, str]:
+    """Return the (columns enum, currency, date format) used for *bank* exports."""
+    plan = PARSE_PLANS[bank]
+    return plan.columns, plan.currency, plan.date_format
+
+
+def read_header(source: Union[str, IO]) -> list[str]:
+    """Return the column names on the first line of *source*, leaving file objects unmoved."""
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as fileobj:
+            line = fileobj.readline(_MAX_HEADER_BYTES)
+    else:
+        position = source.tell()
+        line = source.readline(_MAX_HEADER_BYTES)
+        source.seek(position)
+    try:
+        text = line.decode("utf-8-sig")
+    except UnicodeDecodeError as exc:
+        raise MalformedCSVError(str(exc)) from exc
+    header = next(csv.reader([text]), [])
+    if not header:
+        raise MalformedCSVError("No columns to parse from file")
+    return header
+
+
+def detect_bank(source: Union[str, IO]) -> Bank:
+    """Return the bank whose export columns all appear in the header of *source*."""
+    header = set(read_header(source))
+    for bank, plan in PARSE_PLANS.items():
+        if header.issuperset(plan.usecols):
+            return bank
+    raise InvalidStatementError(
+        f"Could not detect the bank from columns {sorted(header)}; pass bank explicitly"
+    )
+
+
+def read_statement(
+    source: Union[str, IO], bank: Bank, chunk_rows: Optional[int] = None
+) -> Iterator[pd.DataFrame]:
+    """Yield the *bank* statement CSV at *source* as DataFrames of string columns.
+
+    Only the columns of the bank's :class:`ParsePlan` are parsed. With
+    *chunk_rows* the file is read lazily, *chunk_rows* rows at a time;
+    otherwise a single frame holding the whole file is yielded. pyarrow's
+    streaming reader is used when it is installed, and pandas otherwise or
+    when pyarrow rejects the start of the file (e.g. ragged rows).
+    """
+    plan = PARSE_PLANS[bank]
+    header = read_header(source)
+    missing = [column for column in plan.usecols if column not in header]
+    if missing:
+        raise InvalidStatementError(f"Missing required columns: {missing} in {header}")
+
+    if pa_csv is not None:
+        yielded = False
+        try:
+            for frame in _read_arrow(source, plan, header, chunk_rows):
+                yielded = True
+                yield frame
+            return
+        except pa.ArrowInvalid as exc:
+            if yielded:
+                raise MalformedCSVError(str(exc)) from exc
+        if not isinstance(source, (str, os.PathLike)):
+            source.seek(0)
+    yield from _read_pandas(source, plan, chunk_rows)
+
+
+def _read_pandas(
+    source: Union[str, IO], plan: ParsePlan, chunk_rows: Optional[int]
+) -> Iterator[pd.DataFrame]:
+    options = {"usecols": plan.usecols, "dtype": plan.dtypes}
+    try:
+        if chunk_rows is None:
+            yield pd.read_csv(source, **options)
+            return
+        reader = pd.read_csv(source, chunksize=chunk_rows, **options)
+    except Exception as exc:
+        raise MalformedCSVError(str(exc)) from exc
+    with reader:
+        while True:
+            try:
+                chunk = next(reader)
+            except StopIteration:
+                return
+            except Exception as exc:
+                raise MalformedCSVError(str(exc)) from exc
+            yield chunk
+
+
+def _read_arrow(
+    source: Union[str, IO], plan: ParsePlan, header: list[str], chunk_rows: Optional[int]
+) -> Iterator[pd.DataFrame]:
+    """Stream *source* with pyarrow, re-slicing its blocks into *chunk_rows*-row frames."""
+    # Lloyds headers end with a comma that the data rows lack; drop such
+    # trailing unnamed columns so the column counts agree.
+    while header and not header[-1]:
+        header = header[:-1]
+    reader = pa_csv.open_csv(
+        source,
+        read_options=pa_csv.ReadOptions(
+            column_names=header, skip_rows=1, block_size=_ARROW_BLOCK_BYTES
+        ),
+        convert_options=pa_csv.ConvertOptions(
+            include_columns=plan.usecols,
+            column_types={column: pa.string() for column in plan.usecols},
+            strings_can_be_null=True,
+        ),
+    )
+    pending: list = []
+    pending_rows = 0
+    offset = 0
+
+    def to_frame(table) -> pd.DataFrame:
+        frame = table.to_pandas()
+        frame.index = pd.RangeIndex(offset, offset + len(frame))
+        return frame
+
+    for batch in reader:
+        pending.append(batch)
+        pending_rows += batch.num_rows
+        while chunk_rows is not None and pending_rows >= chunk_rows:
+            table = pa.Table.from_batches(pending)
+            yield to_frame(table.slice(0, chunk_rows))
+            offset += chunk_rows
+            rest = table.slice(chunk_rows)
+            pending, pending_rows = rest.to_batches(), rest.num_rows
+    if pending_rows or offset == 0:
+        yield to_frame(pa.Table.from_batches(pending, schema=reader.schema))
+
+
+# Currency symbols, thousands separators and stray spaces in amount cells
+_AMOUNT_NOISE = r"[\s$£€,]"
+
+
+def parse_amounts(values: pd.Series) -> pd.Series:
+    """Parse amount cells such as ``"$1,234.56"`` into integer minor units (cents, pence).
+
+    Returns an ``Int64`` series aligned to *values*; blank or unparseable
+    cells become ``<NA>``. With pyarrow the cleaned text is cast straight
+    to a two-place decimal, so no float is involved; cells that cast
+    rejects (stray text, sub-cent digits) send the column through pandas,
+    which coerces them and rounds to the nearest cent.
+    """
+    if pa is not None:
+        try:
+            return _parse_amounts_arrow(values)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            pass
+    if pd.api.types.is_numeric_dtype(values):
+        numbers = values
+    else:
+        numbers = pd.to_numeric(values.str.replace(_AMOUNT_NOISE, "", regex=True), errors="coerce")
+    return (numbers * 100).round().astype("Int64")
+
+
+def _parse_amounts_arrow(values: pd.Series) -> pd.Series:
+    cleaned = pa_compute.replace_substring_regex(
+        pa.array(values, type=pa.string(), from_pandas=True), _AMOUNT_NOISE, ""
+    )
+    cleaned = pa_compute.if_else(
+        pa_compute.equal(cleaned, ""), pa.scalar(None, pa.string()), cleaned
+    )
+    cents = pa_compute.cast(
+        pa_compute.multiply(pa_compute.cast(cleaned, pa.decimal128(18, 2)), 100),
+        pa.int64(),
+    )
+    result = cents.to_pandas(types_mapper={pa.int64(): pd.Int64Dtype()}.get)
+    result.index = values.index
+    return result
+
+
+def prepare_transactions(
+    df: pd.DataFrame,
+    bank: Bank,
+    categorizer: Union[CachedCategorizer, CategorizerSnapshot],
+    timings: Optional[StageTimings] = None,
+) -> pd.DataFrame:
+    """Normalize a raw *bank* statement frame and categorize its rows.
+
+    Returns a frame with ``date``, ``description``, ``merchant_key``,
+    ``withdrawal_cents``, ``deposit_cents`` (``Int64`` minor units),
+    ``category`` and ``sub_category`` columns. Date parsing, amount parsing
+    and categorization are timed into *timings* as ``parse_dates``,
+    ``parse_amounts`` and ``categorize``.
+    """
+    if timings is None:
+        timings = StageTimings()
+    plan = PARSE_PLANS[bank]
+    columnsEnum, date_format = plan.columns, plan.date_format
+
+    # Basic column sanity‑check – expect these four canonical names.
+    desired_columns = [column.value for column in columnsEnum]
+    missing = [col for col in desired_columns if col not in df.columns]
+    if missing:
+        raise InvalidStatementError(f"Missing required columns: {missing} in {df.columns}")
+
+    df = df[desired_columns].copy()
+    rows = len(df)
+    # Normalize dates per bank format
+    with timings.stage("parse_dates", rows):
+        df[columnsEnum.DATE.value] = pd.to_datetime(
+            df[columnsEnum.DATE.value],
+            format=date_format,
+            errors="coerce",
+        ).dt.date
+    invalid_date_count = df[columnsEnum.DATE.value].isna().sum()
+    if invalid_date_count:
+        raise InvalidStatementError(
+            f"Invalid date format for {invalid_date_count} row(s). "
+            f"Expected format {date_format} for bank {bank.value}."
+        )
+    # Normalize amounts to integer minor units (blank cells become <NA>)
+    with timings.stage("parse_amounts", rows):
+        for column in (columnsEnum.WITHDRAWAL.value, columnsEnum.DEPOSIT.value):
+            df[column] = parse_amounts(df[column])
+
+    with timings.stage("categorize", rows):
+        categories = categorizer.categorize_batch(df[columnsEnum.DESCRIPTION.value])
+    return pd.DataFrame({
+        "date": df[columnsEnum.DATE.value],
+        "description": df[columnsEnum.DESCRIPTION.value],
+        "merchant_key": categories["merchant_key"],
+        "withdrawal_cents": df[columnsEnum.WITHDRAWAL.value],
+        "deposit_cents": df[columnsEnum.DEPOSIT.value],
+        "category": categories["category"],
+        "sub_category": categories["sub_category"],
+    })
@@ -0,0 +1,112 @@
+import logging
+import os
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import IO, Callable
+
+from .db.jobs import (
+    claim_job,
+    create_job,
+    finish_job,
+    release_job,
+    report_progress,
+    requeue_interrupted_jobs,
+)
+
+logger = logging.getLogger(__name__)
+
+# process(source, bank, filename, progress) -> result; progress(rows_processed)
+ProcessFn = Callable[[IO[bytes], str, str, Callable[[int], None]], dict]
+
+
+class IngestJobQueue:
+    """Run uploads in the background on a bounded pool of worker threads.
+
+    Jobs are recorded in the ``ingest_jobs`` table and their files spooled
+    to *spool_dir*, so no broker is needed and queued work survives a
+    restart: :meth:`start` re-submits every job left queued, and every
+    running job whose process is gone. Workers claim jobs with an atomic
+    state change, so a job submitted twice still runs once, and hold a lock
+    on the job for as long as it runs; each running job keeps one pooled
+    connection checked out for that.
+    """
+
+    def __init__(self, engine, process: ProcessFn, spool_dir: str, workers: int = 2):
+        self.engine = engine
+        self.process = process
+        self.spool_dir = spool_dir
+        self.workers = workers
+        self._executor = None
+
+    def start(self) -> None:
+        """Start the workers and resume jobs left over from a previous run."""
+        os.makedirs(self.spool_dir, exist_ok=True)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, self.workers), thread_name_prefix="ingest-job"
+        )
+        with self.engine.begin() as conn:
+            pending = requeue_interrupted_jobs(conn)
+        if pending:
+            logger.info("Resuming %d queued ingest job(s)", len(pending))
+        for job_id in pending:
+            self._executor.submit(self._run, job_id)
+
+    def shutdown(self) -> None:
+        """Stop the workers; jobs still queued or running resume on the next start."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def submit(self, fileobj: IO[bytes], bank: str, filename: str) -> int:
+        """Spool *fileobj*, queue a job for it and return the job id. Blocking."""
+        if self._executor is None:
+            raise RuntimeError("Ingest job queue is not running")
+        handle, spool_path = tempfile.mkstemp(suffix=".csv", dir=self.spool_dir)
+        try:
+            with os.fdopen(handle, "wb") as spool:
+                fileobj.seek(0)
+                shutil.copyfileobj(fileobj, spool)
+            with self.engine.begin() as conn:
+                job_id = create_job(conn, bank, filename, spool_path)
+        except BaseException:
+            os.unlink(spool_path)
+            raise
+        self._executor.submit(self._run, job_id)
+        return job_id
+
+    def _run(self, job_id: int) -> None:
+        # The claim's lock lives as long as this connection's session, which
+        # tells other processes starting up that the job is not abandoned.
+        with self.engine.connect() as lock_conn:
+            with lock_conn.begin():
+                job = claim_job(lock_conn, job_id)
+            if job is None:
+                return
+            try:
+                self._process(lock_conn, job)
+            finally:
+                with lock_conn.begin():
+                    release_job(lock_conn, job_id)
+
+    def _process(self, lock_conn, job: dict) -> None:
+        job_id = job["id"]
+
+        def progress(rows_processed: int) -> None:
+            with self.engine.begin() as conn:
+                report_progress(conn, job_id, rows_processed)
+
+        try:
+            with open(job["spool_path"], "rb") as source:
+                result = self.process(source, job["bank"], job["filename"], progress)
+        except Exception as exc:
+            logger.exception("Ingest job %d failed", job_id)
+            outcome = {"error": str(exc) or type(exc).__name__}
+        else:
+            outcome = {"result": result}
+        with lock_conn.begin():
+            finish_job(lock_conn, job_id, **outcome)
+        try:
+            os.unlink(job["spool_path"])
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,231 @@
+"""In-process metrics rendered in the Prometheus text exposition format.
+
+Only what the API needs: counters and histograms with fixed label names,
+plus gauges read at scrape time. Values are per process; with several
+workers each one reports its own.
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+# Upper bounds in seconds, for request latencies and ingest stages alike
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Iterable[str], values: Iterable[object]) -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """A monotonically increasing value per combination of label values."""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values: dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labelvalues: object, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for labelvalues, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_labels(self.labelnames, labelvalues)} {_number(value)}")
+        return lines
+
+
+class Histogram:
+    """Observations counted into cumulative ``le`` buckets per combination of label values."""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        # label values -> (count per bucket, not cumulative; sum)
+        self._series: dict[tuple, tuple[list[int], list[float]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labelvalues: object) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labelvalues)
+            if series is None:
+                series = self._series[labelvalues] = ([0] * len(self.buckets), [0.0])
+            series[0][index] += 1
+            series[1][0] += value
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for labelvalues, (counts, total) in sorted(self._series.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets, counts):
+                    cumulative += count
+                    labels = _labels(
+                        self.labelnames + ("le",), labelvalues + (_number(bound),)
+                    )
+                    lines.append(f"{self.name}_bucket{labels} {cumulative}")
+                labels = _labels(self.labelnames, labelvalues)
+                lines.append(f"{self.name}_sum{labels} {_number(total[0])}")
+                lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+def sampled(
+    name: str,
+    documentation: str,
+    kind: str,
+    samples: Iterable[tuple[dict[str, object], float]],
+) -> list[str]:
+    """Render a metric of type *kind* read at scrape time from ``(labels, value)`` *samples*.
+
+    For values kept elsewhere, such as a cache's own hit counter or the
+    connection pool's current size.
+    """
+    lines = [f"# HELP {name} {documentation}", f"# TYPE {name} {kind}"]
+    for labels, value in samples:
+        lines.append(f"{name}{_labels(labels.keys(), labels.values())} {_number(value)}")
+    return lines
+
+
+def exposition(sections: Iterable[list[str]]) -> str:
+    """Join rendered metrics into one exposition document."""
+    return "".join(line + "\n" for section in sections for line in section)
+
+
+class StageTimings:
+    """Wall time, rows and bytes per named stage of one piece of work.
+
+    Repeated stages, e.g. once per chunk of a streamed upload, add up.
+    Stages keep the order they were first timed in.
+    """
+
+    def __init__(self):
+        self.stages: dict[str, dict[str, float]] = {}
+        self.started = time.perf_counter()
+
+    def add(self, stage: str, seconds: float = 0.0, rows: int = 0, nbytes: int = 0) -> None:
+        totals = self.stages.setdefault(stage, {"rows": 0, "bytes": 0, "seconds": 0.0})
+        totals["rows"] += rows
+        totals["bytes"] += nbytes
+        totals["seconds"] += seconds
+
+    @contextmanager
+    def stage(self, stage: str, rows: int = 0, nbytes: int = 0) -> Iterator[None]:
+        """Time the body of the ``with`` block as *stage*, even if it raises."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, time.perf_counter() - start, rows, nbytes)
+
+    def iterate(self, stage: str, frames: Iterable[T]) -> Iterator[T]:
+        """Yield from *frames*, timing each step as *stage* with the frame's length as rows.
+
+        Only producing a frame is timed, not what the consumer does with it.
+        """
+        frames = iter(frames)
+        while True:
+            start = time.perf_counter()
+            try:
+                frame = next(frames)
+            except StopIteration:
+                self.add(stage, time.perf_counter() - start)
+                return
+            self.add(stage, time.perf_counter() - start, len(frame))
+            yield frame
+
+    def as_dict(self) -> dict[str, dict]:
+        """Return each stage's rows, bytes, seconds and rows per second, then a ``total``.
+
+        The total's rows and bytes are the most any stage handled, and its
+        time is the wall time since this object was created, so it includes
+        work between the timed stages.
+        """
+        result = {}
+        stages = {
+            **self.stages,
+            "total": {
+                "rows": max((totals["rows"] for totals in self.stages.values()), default=0),
+                "bytes": max((totals["bytes"] for totals in self.stages.values()), default=0),
+                "seconds": time.perf_counter() - self.started,
+            },
+        }
+        for stage, totals in stages.items():
+            seconds = totals["seconds"]
+            result[stage] = {
+                "rows": totals["rows"],
+                "bytes": totals["bytes"],
+                "seconds": round(seconds, 6),
+                "rows_per_second": (
+                    round(totals["rows"] / seconds, 1) if totals["rows"] and seconds else None
+                ),
+            }
+        return result
+
+
+class RequestMetricsMiddleware:
+    """ASGI middleware observing each HTTP request's latency into *histogram*.
+
+    The histogram is labelled by method, route template (``/transactions/{transaction_id}``
+    rather than the raw path, to bound the number of series) and status code.
+    Latency runs until the last body chunk is sent, so streamed responses
+    count in full.
+    """
+
+    def __init__(self, app, histogram: Histogram):
+        self.app = app
+        self.histogram = histogram
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # The router records the matched route in the shared scope.
+            route = scope.get("route")
+            self.histogram.observe(
+                time.perf_counter() - start,
+                scope["method"],
+                getattr(route, "path", "<unmatched>"),
+                status,
+            )
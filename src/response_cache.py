@@ -0,0 +1,107 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from enum import Enum
+from typing import Hashable, Optional
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    body: bytes
+    etag: str
+    headers: dict[str, str]
+    generation: int
+    expires_at: float
+
+
+class ResponseCache:
+    """Bounded LRU cache of rendered JSON responses with TTL expiry.
+
+    Entries are tagged with the data generation they were computed in;
+    :meth:`bump` starts a new generation after every write, so nothing
+    computed before the write is served after it. The generation counter is
+    per process: with several workers, writes made through another worker
+    only become visible here once the TTL lapses.
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: float = 60.0, max_entry_bytes: int = 1_000_000):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.max_entry_bytes = max_entry_bytes
+        self.generation = 0
+        self._entries: OrderedDict[Hashable, CachedResponse] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(endpoint: str, params: dict[str, object]) -> tuple:
+        """Return a cache key for *endpoint* from its normalized query parameters."""
+        normalized = tuple(
+            sorted(
+                (name, value.value if isinstance(value, Enum) else value)
+                for name, value in params.items()
+                if value is not None
+            )
+        )
+        return (endpoint, normalized)
+
+    def get(self, key: Hashable) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry.generation != self.generation or entry.expires_at <= time.monotonic():
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(
+        self, key: Hashable, generation: int, body: bytes, headers: dict[str, str]
+    ) -> CachedResponse:
+        """Store *body* computed during *generation* and return the entry.
+
+        The entry is returned but not stored when a write has happened since
+        *generation* was read, or when the body exceeds ``max_entry_bytes``.
+        """
+        entry = CachedResponse(
+            body=body,
+            etag=f'"{hashlib.sha1(body).hexdigest()}"',
+            headers=headers,
+            generation=generation,
+            expires_at=time.monotonic() + self.ttl,
+        )
+        with self._lock:
+            if generation != self.generation or len(body) > self.max_entry_bytes:
+                return entry
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return entry
+
+    def bump(self) -> None:
+        """Start a new data generation, invalidating every cached response."""
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        """Return cache counters: size, maxsize, generation, hits, misses and evictions."""
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "generation": self.generation,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
@@ -0,0 +1,145 @@
+import logging
+import re
+import threading
+from typing import Iterable, Optional
+
+from .categorizer import CachedCategorizer, KeywordMatcher, normalize_description
+from .db.rules import load_rules, rules_version
+
+logger = logging.getLogger(__name__)
+
+
+class InvalidRuleError(ValueError):
+    """A rule has no keywords, or a keyword is not a valid regular expression or cannot match."""
+
+
+# Characters that make a keyword a pattern rather than plain text.
+_REGEX_SYNTAX = frozenset(".^$*+?{}[]\\|()")
+
+
+def unmatchable_keywords(keywords: Iterable[str]) -> list[str]:
+    """Return the plain-text *keywords* that no merchant key can contain.
+
+    Keywords are matched against :func:`normalize_description` of a row,
+    so a keyword holding what normalization strips (a card suffix, a date,
+    a long reference number, a run of spaces) never matches. Keywords with
+    regular expression syntax are not checked.
+    """
+    unmatchable = []
+    for keyword in keywords:
+        text = keyword.lower()
+        if not _REGEX_SYNTAX.intersection(text) and normalize_description(text) != text.strip():
+            unmatchable.append(keyword)
+    return unmatchable
+
+
+def validate_keywords(keywords: Iterable[str]) -> list[str]:
+    """Return *keywords* stripped of blanks, raising :class:`InvalidRuleError` if unusable."""
+    keywords = [keyword for keyword in keywords if keyword.strip()]
+    if not keywords:
+        raise InvalidRuleError("A rule needs at least one keyword")
+    for keyword in keywords:
+        try:
+            re.compile(keyword.lower())
+        except re.error as exc:
+            raise InvalidRuleError(f"Invalid keyword {keyword!r}: {exc}") from exc
+    unmatchable = unmatchable_keywords(keywords)
+    if unmatchable:
+        keyword = unmatchable[0]
+        raise InvalidRuleError(
+            f"Keyword {keyword!r} can never match: keywords are matched against the merchant "
+            f"key, which has card suffixes, dates, phone numbers, reference ids and repeated "
+            f"spaces stripped; it reduces to {normalize_description(keyword)!r}"
+        )
+    return keywords
+
+
+def validate_rule_set(rules: Iterable[dict]) -> None:
+    """Raise :class:`InvalidRuleError` unless *rules*, in match order, compile into one matcher.
+
+    Keywords that compile alone can still break the combined pattern, e.g. a
+    backreference pushed past group 99 by the groups of earlier rules, so
+    the rule endpoints check the whole set they are about to commit.
+    """
+    try:
+        KeywordMatcher(rules)
+    except re.error as exc:
+        raise InvalidRuleError(f"Rules do not compile together: {exc}") from exc
+
+
+class RuleReloader:
+    """Keep a categorizer's matcher in step with the ``category_rules`` table.
+
+    A daemon thread polls the rules version every *poll_seconds*, or at once
+    after :meth:`notify`, and when it moved compiles a new
+    :class:`KeywordMatcher` tagged with that version and swaps it in. The
+    swap is a single assignment, so requests never wait on a compile and an
+    upload holding a :meth:`CachedCategorizer.snapshot` keeps categorizing
+    with the rules it started with. Polling the database, rather than
+    reacting to local writes only, also picks up edits made through other
+    API processes or directly in SQL.
+    """
+
+    def __init__(self, engine, categorizer: CachedCategorizer, poll_seconds: float = 5.0):
+        self.engine = engine
+        self.categorizer = categorizer
+        self.poll_seconds = poll_seconds
+        # Last version loaded, even if it failed to compile, so a bad rule
+        # is reported once rather than on every poll.
+        self.loaded_version: Optional[int] = None
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def active_version(self) -> Optional[int]:
+        """Version of the rules the categorizer is currently matching with."""
+        return self.categorizer.matcher.version
+
+    def start(self) -> None:
+        """Load the current rules, then start watching for changes."""
+        self.reload()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="rule-reloader", daemon=True)
+        self._thread.start()
+
+    def shutdown(self) -> None:
+        if self._thread is not None:
+            self._stop.set()
+            self._wake.set()
+            self._thread.join(timeout=self.poll_seconds)
+            self._thread = None
+
+    def notify(self) -> None:
+        """Check for new rules now instead of at the next poll."""
+        self._wake.set()
+
+    def reload(self) -> bool:
+        """Rebuild the matcher if the rules version moved; return whether it was swapped."""
+        with self.engine.begin() as conn:
+            if rules_version(conn) == self.loaded_version:
+                return False
+            version, rules = load_rules(conn)
+        self.loaded_version = version
+        try:
+            matcher = KeywordMatcher(rules, version=version)
+        except re.error:
+            logger.exception(
+                "Category rules version %d do not compile; keeping version %s",
+                version, self.active_version,
+            )
+            return False
+        self.categorizer.use_matcher(matcher)
+        logger.info("Loaded %d category rule(s), version %d", len(rules), version)
+        return True
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(self.poll_seconds)
+            self._wake.clear()
+            if self._stop.is_set():
+                return
+            try:
+                self.reload()
+            except Exception:
+                logger.exception("Reloading category rules failed")
@@ -0,0 +1,16 @@
+import pytest
+
+
+@pytest.fixture(scope="session")
+def app_module():
+    """The app module and a test client, started once per session.
+
+    Shutdown closes the app's module-level executors, so a second startup in
+    the same process could not run database work.
+    """
+    from fastapi.testclient import TestClient
+
+    from src import main
+
+    with TestClient(main.app) as client:
+        yield main, client
@@ -0,0 +1,138 @@
+"""KeywordMatcher must label every description exactly as the original loop did."""
+import csv
+import importlib.util
+import re
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from src.categorizer import (
+    UNCATEGORIZED,
+    CachedCategorizer,
+    KeywordMatcher,
+    label_value,
+    normalize_description,
+)
+
+ROOT = Path(__file__).resolve().parents[1]
+EXAMPLE_CSVS = {
+    ROOT / "src" / "bank_csvs" / "charles_schwab_example.csv": "Description",
+    ROOT / "src" / "bank_csvs" / "lloyds_example.csv": "Transaction Description",
+}
+
+
+def load_example_keyword_maps() -> list[dict]:
+    spec = importlib.util.spec_from_file_location(
+        "keywords_example", ROOT / "src" / "constants" / "keywords.example.py"
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.KEYWORD_CATEGORY_MAPS
+
+
+def reference_categorize(keyword_maps: list[dict], description: str) -> tuple[str, str]:
+    """The original categorize: walk the maps keyword by keyword with re.search."""
+    text = description.lower()
+    for obj in keyword_maps:
+        for keyword in obj["keywords"]:
+            if re.search(keyword.lower(), text):
+                return label_value(obj["category"]), label_value(obj["sub_category"])
+    return UNCATEGORIZED
+
+
+def example_descriptions() -> list[str]:
+    descriptions = []
+    for path, column in EXAMPLE_CSVS.items():
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            descriptions.extend(row[column] or "" for row in csv.DictReader(f))
+    return descriptions
+
+
+def rule(name: str, *keywords: str) -> dict:
+    return {"category": name, "sub_category": "", "keywords": list(keywords)}
+
+
+# Keywords whose meaning depends on their position in the combined pattern:
+# capturing groups, backreferences, conditionals, anchors and inline flags.
+ADVERSARIAL_MAPS = [
+    rule("groups", "(q)r", "(x)(y)z"),
+    rule("backreference", r"(a)\1"),
+    rule("two digit backreference", r"(b)(c)(d)(e)(f)(g)(h)(i)(j)(k)\10"),
+    rule("backreference then digit", r"(m)\1 ?7"),
+    rule("octal escape", r"\101\102"),
+    rule("class", r"[\1]x", r"[]\1]y", r"(n)[^]\1]\1"),
+    rule("conditional", r"(<)?tag(?(1)>|!)"),
+    rule("start anchor", "^start"),
+    rule("end anchor", "end$"),
+    rule("both anchors", r"^whole$", r"\bword\b"),
+    rule("global flags", "(?i)shout", "(?x) s p a c e d  # comment"),
+    rule("empty", ""),
+]
+
+ADVERSARIAL_DESCRIPTIONS = [
+    "qr", "xyz", "baab", "aa", "bcdefghijkk", "bcdefghijkb", "mm7", "mm 7", "m17",
+    "ab", "AB", "\x01x", "]y", "\x01y", "nnn", "n]n", "zz", "<tag>", "tag!", "<tag!",
+    "start here", "not start", "the end", "end of", "whole", "whole thing", "a word",
+    "swordfish", "SHOUT", "spaced", "s p a c e d", "",
+]
+
+
+@pytest.fixture(scope="module")
+def example_maps() -> list[dict]:
+    return load_example_keyword_maps()
+
+
+def test_example_statements_match_reference(example_maps):
+    matcher = KeywordMatcher(example_maps)
+    descriptions = example_descriptions()
+    assert descriptions
+    for description in descriptions:
+        assert matcher.match(description) == reference_categorize(example_maps, description), (
+            description
+        )
+
+
+def test_adversarial_keywords_match_reference():
+    matcher = KeywordMatcher(ADVERSARIAL_MAPS)
+    for description in ADVERSARIAL_DESCRIPTIONS:
+        assert matcher.match(description) == reference_categorize(
+            ADVERSARIAL_MAPS, description
+        ), description
+
+
+def test_adversarial_keywords_after_example_rules(example_maps):
+    # Every example rule adds groups before the adversarial keywords.
+    keyword_maps = example_maps + ADVERSARIAL_MAPS
+    matcher = KeywordMatcher(keyword_maps)
+    for description in ADVERSARIAL_DESCRIPTIONS + example_descriptions()[:50]:
+        assert matcher.match(description) == reference_categorize(keyword_maps, description), (
+            description
+        )
+
+
+def test_first_matching_rule_wins():
+    matcher = KeywordMatcher([rule("first", "(a)\\1"), rule("second", "aa")])
+    assert matcher.match("xaax") == ("first", "")
+
+
+class RecordingPool:
+    """Stands in for ProcessPoolMatcher, matching in process and recording batch sizes."""
+
+    def __init__(self):
+        self.batches = []
+
+    def match(self, matcher, descriptions):
+        self.batches.append(len(descriptions))
+        keys = [normalize_description(description) for description in descriptions]
+        return [(key, matcher.match(key)) for key in keys]
+
+
+def test_pool_used_from_default_threshold(example_maps):
+    pool = RecordingPool()
+    categorizer = CachedCategorizer(KeywordMatcher(example_maps), pool=pool)
+    descriptions = pd.Series([f"shop {number}" for number in range(20_000)])
+    categorizer.categorize_batch(descriptions[:19_999])
+    assert pool.batches == []
+    categorizer.categorize_batch(descriptions)
+    assert pool.batches == [20_000]
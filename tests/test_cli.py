@@ -0,0 +1,44 @@
+import shutil
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("src.constants.keywords", reason="src/constants/keywords.py is not set up")
+
+from src import cli  # noqa: E402
+
+EXAMPLES = Path(__file__).resolve().parents[1] / "src" / "bank_csvs"
+
+
+@pytest.fixture
+def statements(tmp_path: Path) -> Path:
+    """Two statements with the same file name in different directories."""
+    root = tmp_path / "statements"
+    (root / "schwab").mkdir(parents=True)
+    (root / "lloyds").mkdir()
+    shutil.copy(EXAMPLES / "charles_schwab_example.csv", root / "schwab" / "stmt.csv")
+    shutil.copy(EXAMPLES / "lloyds_example.csv", root / "lloyds" / "stmt.csv")
+    return root
+
+
+def example_rows(name: str) -> int:
+    return len(pd.read_csv(EXAMPLES / name))
+
+
+@pytest.mark.parametrize("workers", ["1", "2"])
+def test_glob_inputs_sharing_a_stem_keep_their_directories(statements, tmp_path, workers):
+    out = tmp_path / "out"
+    assert cli.main([str(statements / "**" / "*.csv"), "-o", str(out), "-j", workers]) == 0
+    schwab = pd.read_csv(out / "schwab" / "stmt.categorized.csv")
+    lloyds = pd.read_csv(out / "lloyds" / "stmt.categorized.csv")
+    assert len(schwab) == example_rows("charles_schwab_example.csv")
+    assert len(lloyds) == example_rows("lloyds_example.csv")
+    assert not (out / "stmt.categorized.csv").exists()
+
+
+def test_inputs_writing_the_same_output_are_rejected_before_any_work(statements, tmp_path):
+    out = tmp_path / "out"
+    inputs = [str(statements / "schwab" / "stmt.csv"), str(statements / "lloyds" / "stmt.csv")]
+    assert cli.main([*inputs, "-o", str(out)]) == 1
+    assert not out.exists()
@@ -0,0 +1,95 @@
+"""Deleting some of an upload's rows must let the same file restore them.
+
+Needs PostgreSQL: set ``DATABASE_URL`` to run. The statement is dated
+2096 with amounts unique to the run; its rows and uploads are removed
+afterwards.
+"""
+import csv
+import os
+import random
+
+import pytest
+from sqlalchemy import text
+
+pytestmark = pytest.mark.skipif(
+    not os.getenv("DATABASE_URL"), reason="DATABASE_URL is not set"
+)
+
+ROWS = 20
+
+
+@pytest.fixture
+def statement(app_module, tmp_path):
+    """Path of a Schwab statement of ROWS rows; its rows and ingests are deleted afterwards."""
+    main, _ = app_module
+    path = tmp_path / "statement.csv"
+    base = random.randrange(10**9)
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f, quoting=csv.QUOTE_ALL)
+        writer.writerow(
+            ["Date", "Status", "Type", "CheckNumber", "Description", "Withdrawal", "Deposit",
+             "RunningBalance"]
+        )
+        for index in range(ROWS):
+            cents = base + index
+            writer.writerow(
+                ["06/08/2096", "Posted", "VISA", "", f"SHOP {index}",
+                 f"${cents // 100}.{cents % 100:02d}", "", ""]
+            )
+    yield path
+    with main.engine.begin() as conn:
+        ingest_ids = conn.execute(
+            text("DELETE FROM transactions WHERE date = '2096-06-08' RETURNING ingest_id")
+        ).scalars().all()
+        conn.execute(text("DELETE FROM ingests WHERE id = ANY(:ids)"), {"ids": ingest_ids})
+
+
+def upload(client, path) -> dict:
+    with open(path, "rb") as f:
+        response = client.post(
+            "/transactions", files={"file": ("statement.csv", f)}, data={"bank": "schwab"}
+        )
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+@pytest.mark.parametrize(
+    "delete",
+    [
+        lambda client, ids: client.request("DELETE", "/transactions", json={"ids": ids[:3]}),
+        lambda client, ids: client.request(
+            "DELETE",
+            "/transactions",
+            json={"filter": {"start_date": "2096-06-08", "end_date": "2096-06-08"}},
+        ),
+        lambda client, ids: client.delete(f"/transactions/{ids[0]}"),
+    ],
+    ids=["ids", "filter", "one"],
+)
+def test_reupload_restores_deleted_rows(app_module, statement, delete):
+    _, client = app_module
+    first = upload(client, statement)
+    assert first["inserted_rows"] == ROWS
+    assert upload(client, statement)["duplicate_of"] == first["ingest_id"]
+
+    ids = [
+        row["id"]
+        for row in client.get(
+            "/transactions", params={"start_date": "2096-06-08", "end_date": "2096-06-08"}
+        ).json()
+    ]
+    response = delete(client, ids)
+    assert response.status_code == 200, response.text
+    remaining = len(
+        client.get(
+            "/transactions", params={"start_date": "2096-06-08", "end_date": "2096-06-08"}
+        ).json()
+    )
+
+    again = upload(client, statement)
+    assert again.get("duplicate_of") is None
+    assert again["inserted_rows"] == ROWS - remaining
+    assert again["skipped_rows"] == remaining
+    # The first upload keeps its record, so its remaining rows can still be deleted by id.
+    response = client.request("DELETE", "/transactions", json={"ingest_id": first["ingest_id"]})
+    assert response.json() == {"deleted_rows": remaining}
@@ -0,0 +1,54 @@
+"""Startup must requeue only the running jobs no live process holds.
+
+Needs PostgreSQL: set ``DATABASE_URL`` to run. The jobs created here are
+deleted afterwards.
+"""
+import os
+
+import pytest
+from sqlalchemy import text
+
+from src.db.jobs import claim_job, create_job, get_job, release_job, requeue_interrupted_jobs
+
+pytestmark = pytest.mark.skipif(
+    not os.getenv("DATABASE_URL"), reason="DATABASE_URL is not set"
+)
+
+
+@pytest.fixture
+def engine(app_module):
+    main, _ = app_module
+    return main.engine
+
+
+@pytest.fixture
+def jobs(engine):
+    """Two queued jobs, deleted afterwards."""
+    with engine.begin() as conn:
+        ids = [create_job(conn, "schwab", "stmt.csv", f"/nonexistent/{n}.csv") for n in range(2)]
+    yield ids
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM ingest_jobs WHERE id = ANY(:ids)"), {"ids": ids})
+
+
+def test_requeue_leaves_jobs_of_live_workers_running(engine, jobs):
+    live, abandoned = jobs
+    with engine.connect() as live_conn, engine.connect() as abandoned_conn:
+        with live_conn.begin():
+            assert claim_job(live_conn, live) is not None
+        with abandoned_conn.begin():
+            assert claim_job(abandoned_conn, abandoned) is not None
+        # The worker of the abandoned job goes away without finishing it.
+        abandoned_conn.invalidate()
+
+        with engine.begin() as conn:
+            queued = requeue_interrupted_jobs(conn)
+            assert abandoned in queued and live not in queued
+            assert get_job(conn, live)["state"] == "running"
+            assert get_job(conn, abandoned)["state"] == "queued"
+
+        # A second claim of the live job fails while its worker holds it.
+        with engine.connect() as conn, conn.begin():
+            assert claim_job(conn, live) is None
+        with live_conn.begin():
+            release_job(live_conn, live)
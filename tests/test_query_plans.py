@@ -0,0 +1,162 @@
+"""The read endpoints' queries must use the date indexes on a realistically sized table.
+
+Needs PostgreSQL: set ``DATABASE_URL`` to run. The statements are captured
+from real requests, then run with EXPLAIN ANALYZE against a million seeded
+rows that replace the table's contents inside a transaction that is rolled
+back, so plans do not depend on what the database holds and it is left as
+it was.
+"""
+import json
+import os
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import event, text
+
+from src.db.partitions import create_partitions, is_partitioned, months_between
+
+pytestmark = pytest.mark.skipif(
+    not os.getenv("DATABASE_URL"), reason="DATABASE_URL is not set"
+)
+
+SEEDED_ROWS = 1_000_000
+SEEDED_DAYS = 3650
+FIRST_DAY = date(2015, 1, 1)
+
+SEED_SQL = f"""
+    INSERT INTO transactions
+        (date, description, withdrawal_cents, deposit_cents, sub_category_id, bank_id)
+    SELECT DATE '{FIRST_DAY.isoformat()}' + (n % {SEEDED_DAYS}),
+           'merchant ' || (n % 5000),
+           n % 10000,
+           NULL,
+           ids.categories[1 + n % NULLIF(cardinality(ids.categories), 0)],
+           ids.banks[1 + n % NULLIF(cardinality(ids.banks), 0)]
+    FROM generate_series(1, {SEEDED_ROWS}) AS n,
+         (SELECT ARRAY(SELECT id FROM categories ORDER BY id) AS categories,
+                 ARRAY(SELECT id FROM banks ORDER BY id) AS banks) AS ids
+"""
+
+
+@pytest.fixture(scope="module")
+def seeded(app_module):
+    """A connection whose open transaction holds the seeded rows; rolled back afterwards."""
+    main, _ = app_module
+    with main.engine.connect() as conn:
+        transaction = conn.begin()
+        try:
+            if is_partitioned(conn):
+                create_partitions(
+                    conn, months_between(FIRST_DAY, FIRST_DAY + timedelta(days=SEEDED_DAYS))
+                )
+            conn.execute(text("DELETE FROM transactions"))
+            conn.execute(text(SEED_SQL))
+            conn.execute(text("ANALYZE transactions"))
+            conn.execute(text("ANALYZE transaction_daily_rollups"))
+            yield conn
+        finally:
+            transaction.rollback()
+
+
+def captured_statements(main, client, url: str, params: dict) -> list[tuple[str, object]]:
+    """Return the SELECT statements, with parameters, that a GET of *url* runs."""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    main.RESPONSE_CACHE.bump()
+    event.listen(main.engine, "before_cursor_execute", capture)
+    try:
+        response = client.get(url, params=params)
+    finally:
+        event.remove(main.engine, "before_cursor_execute", capture)
+    assert response.status_code == 200, response.text
+    return statements
+
+
+def plan_nodes(plan: dict):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+def explain(conn, statements: list[tuple[str, object]], table: str) -> list[dict]:
+    """EXPLAIN ANALYZE the captured statement reading *table* on *conn*; return its plan nodes."""
+    [(statement, parameters)] = [
+        (statement, parameters) for statement, parameters in statements if table in statement
+    ]
+    cursor = conn.connection.cursor()
+    cursor.execute("EXPLAIN (ANALYZE, FORMAT JSON) " + statement, parameters)
+    plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return list(plan_nodes(plan[0]["Plan"]))
+
+
+def index_scans(conn, nodes: list[dict], bitmap: bool = False) -> list[str]:
+    """Indexes scanned by *nodes*, including bitmap scans if *bitmap*.
+
+    A partition's copy of an index is reported as the partitioned index
+    on ``transactions`` it belongs to.
+    """
+    types = {"Index Scan", "Index Only Scan"} | ({"Bitmap Index Scan"} if bitmap else set())
+    root = text(
+        "SELECT COALESCE(pg_partition_root(CAST(:name AS regclass)), CAST(:name AS regclass))::text"
+    )
+    return [
+        conn.execute(root, {"name": node["Index Name"]}).scalar_one()
+        for node in nodes
+        if node["Node Type"] in types
+    ]
+
+
+def transactions_scans(conn, nodes: list[dict]) -> list[dict]:
+    """The plan nodes scanning ``transactions`` through transactions_date_id_idx."""
+    return [
+        node
+        for node in nodes
+        if node.get("Index Name")
+        and index_scans(conn, [node]) == ["transactions_date_id_idx"]
+    ]
+
+
+@pytest.mark.parametrize(
+    "params, index_cond",
+    [
+        ({"limit": 50}, None),
+        ({"limit": 50, "start_date": "2020-03-01", "end_date": "2020-03-31"}, "date"),
+        # Deep cursors: the page must start at the cursor, not filter the rows before it.
+        ({"limit": 50, "after": "2023-06-01,100"}, "ROW(date, id) >"),
+    ],
+)
+def test_list_seeks_date_id_index(app_module, seeded, params, index_cond):
+    main, client = app_module
+    statements = captured_statements(main, client, "/transactions", params)
+    nodes = explain(seeded, statements, "FROM transactions t")
+    scans = transactions_scans(seeded, nodes)
+    assert scans, index_scans(seeded, nodes)
+    if index_cond:
+        assert any(index_cond in node.get("Index Cond", "") for node in scans), scans
+    for node in scans:
+        assert node.get("Rows Removed by Filter", 0) <= 1000, node
+    # On a partitioned table the branch for rows without a date is planned
+    # as an empty sort; only sorts of rows actually read would cost a seek.
+    sorted_rows = [
+        child["Actual Rows"]
+        for node in nodes
+        if node["Node Type"] == "Sort"
+        for child in node["Plans"]
+    ]
+    assert sum(sorted_rows) <= 1000, sorted_rows
+
+
+def test_summary_date_range_uses_rollup_date_index(app_module, seeded):
+    # The summary reads the daily rollups, whose unique key leads with date.
+    main, client = app_module
+    params = {"start_date": "2020-03-01", "end_date": "2020-03-31"}
+    statements = captured_statements(main, client, "/transactions/summary", params)
+    nodes = explain(seeded, statements, "FROM transaction_daily_rollups r")
+    scans = index_scans(seeded, nodes, bitmap=True)
+    assert any(name.startswith("transaction_daily_rollups") for name in scans), scans
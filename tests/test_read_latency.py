@@ -0,0 +1,77 @@
+"""Reads must keep being served while a large upload is ingested.
+
+Needs PostgreSQL: set ``DATABASE_URL`` to run. The upload is deleted again
+afterwards. Every read asks for a different date range, so it misses the
+response cache and reaches the database.
+"""
+import asyncio
+import os
+import statistics
+import time
+from datetime import date, timedelta
+
+import pytest
+
+pytestmark = pytest.mark.skipif(
+    not os.getenv("DATABASE_URL"), reason="DATABASE_URL is not set"
+)
+
+UPLOAD_ROWS = 100_000
+# Far below the upload's duration: a blocked event loop or a starved
+# connection pool would hold a read for most of the upload. A single read
+# can still wait out one parse slice or chunk write, so the worst read is
+# only held to this bound, and the typical one to a tighter one.
+MAX_READ_SECONDS = 3.0
+MAX_MEDIAN_READ_SECONDS = 0.5
+
+
+async def upload_while_reading(main, path: str) -> tuple[dict, float, list[float]]:
+    """Upload *path* while reading in a loop; return the upload, its seconds and read latencies."""
+    import httpx
+
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+
+        async def upload() -> dict:
+            with open(path, "rb") as f:
+                response = await client.post(
+                    "/transactions", files={"file": ("upload.csv", f)}, data={"bank": "schwab"}
+                )
+            assert response.status_code == 200, response.text
+            return response.json()
+
+        start = time.perf_counter()
+        uploading = asyncio.create_task(upload())
+        latencies = []
+        day = date(2000, 1, 1)
+        while not uploading.done():
+            day += timedelta(days=1)
+            for url, params in (
+                ("/transactions", {"start_date": day.isoformat(), "limit": 50}),
+                ("/transactions/summary", {"start_date": day.isoformat()}),
+            ):
+                sent = time.perf_counter()
+                response = await client.get(url, params=params)
+                latencies.append(time.perf_counter() - sent)
+                assert response.status_code == 200, response.text
+        result = await uploading
+        return result, time.perf_counter() - start, latencies
+
+
+def test_reads_are_served_during_a_large_upload(app_module, tmp_path):
+    from benchmarks.read_latency_during_upload import write_statement
+
+    main, client = app_module
+    path = tmp_path / "statement.csv"
+    write_statement(str(path), UPLOAD_ROWS)
+    result, upload_seconds, latencies = asyncio.run(upload_while_reading(main, str(path)))
+    try:
+        # Reads completed while the upload ran, each well within its duration.
+        assert len(latencies) >= 10, (upload_seconds, latencies)
+        assert max(latencies) < MAX_READ_SECONDS, (upload_seconds, sorted(latencies)[-5:])
+        assert statistics.median(latencies) < MAX_MEDIAN_READ_SECONDS, (
+            upload_seconds, statistics.median(latencies)
+        )
+    finally:
+        if result.get("ingest_id") is not None:
+            client.request("DELETE", "/transactions", json={"ingest_id": result["ingest_id"]})
@@ -0,0 +1,156 @@
+"""transaction_daily_rollups must match a full recompute after every kind of write.
+
+Needs PostgreSQL: set ``DATABASE_URL`` to run. The statements uploaded here
+are dated 2096, which no real export reaches, and every filtered write is
+limited to that year; the rows and uploads are removed afterwards.
+"""
+import csv
+import os
+import random
+import time
+from pathlib import Path
+
+import pytest
+from sqlalchemy import text
+
+from src.db.ingests import delete_ingest
+from src.db.rollups import rebuild_rollups, rollup_mismatches
+
+pytestmark = pytest.mark.skipif(
+    not os.getenv("DATABASE_URL"), reason="DATABASE_URL is not set"
+)
+
+EXAMPLE_CSV = Path(__file__).resolve().parents[1] / "src" / "bank_csvs" / "charles_schwab_example.csv"
+YEAR = {"start_date": "2096-01-01", "end_date": "2096-12-31"}
+
+
+def write_statement(path: Path, rows: int) -> None:
+    """Write *rows* rows of the Schwab example moved to 2096, with amounts unique to this run."""
+    with open(EXAMPLE_CSV, newline="", encoding="utf-8-sig") as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        examples = list(reader)
+    date, withdrawal = header.index("Date"), header.index("Withdrawal")
+    base = random.randrange(10**9)
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f, quoting=csv.QUOTE_ALL)
+        writer.writerow(header)
+        for index in range(rows):
+            row = list(examples[index % len(examples)])
+            row[date] = row[date][:6] + "2096"
+            cents = base + index
+            row[withdrawal] = f"${cents // 100}.{cents % 100:02d}"
+            writer.writerow(row)
+
+
+@pytest.fixture
+def uploads(app_module, tmp_path):
+    """Upload two statements, one of them streamed; clean up their rows and ingests."""
+    main, client = app_module
+    responses = []
+    for name, stream in (("first.csv", False), ("second.csv", True)):
+        path = tmp_path / name
+        write_statement(path, 2000)
+        with open(path, "rb") as f:
+            response = client.post(
+                "/transactions",
+                files={"file": (name, f)},
+                data={"bank": "schwab", "stream": str(stream).lower()},
+            )
+        assert response.status_code == 200, response.text
+        assert response.json()["inserted_rows"] == 2000
+        responses.append(response.json())
+    yield [response["ingest_id"] for response in responses]
+    with main.engine.begin() as conn:
+        conn.execute(
+            text("DELETE FROM transactions WHERE date BETWEEN :start_date AND :end_date"), YEAR
+        )
+        for response in responses:
+            delete_ingest(conn, response["ingest_id"])
+
+
+def assert_consistent(main) -> None:
+    with main.engine.begin() as conn:
+        assert rollup_mismatches(conn) == []
+
+
+def wait_for_rules(client) -> None:
+    """Wait until this process categorizes with the latest rules."""
+    for _ in range(100):
+        body = client.get("/rules").json()
+        if body["active_version"] == body["version"]:
+            return
+        time.sleep(0.05)
+    raise AssertionError("rules were not reloaded")
+
+
+def test_rollups_follow_every_write(app_module, uploads):
+    main, client = app_module
+    assert_consistent(main)
+
+    rules = client.get("/rules").json()["rules"]
+    first, last = rules[0], rules[-1]
+    ids = [
+        row["id"]
+        for row in client.get("/transactions", params={**YEAR, "limit": 300}).json()
+    ]
+
+    # Per-id and filtered category changes.
+    items = [
+        {"id": id_, "category": last["category"], "sub_category": last["sub_category"]}
+        for id_ in ids[:100]
+    ]
+    response = client.patch("/transactions/category", json={"items": items})
+    assert response.status_code == 200, response.text
+    response = client.patch(
+        "/transactions/category",
+        json={
+            "filter": {**YEAR, "category": first["category"]},
+            "category": last["category"],
+            "sub_category": last["sub_category"],
+        },
+    )
+    assert response.status_code == 200, response.text
+    assert_consistent(main)
+
+    # Remap a rule to another category and recategorize, then undo both.
+    for category, sub_category in (
+        (last["category"], last["sub_category"]),
+        (first["category"], first["sub_category"]),
+    ):
+        response = client.patch(
+            f"/rules/{first['id']}", data={"category": category, "sub_category": sub_category}
+        )
+        assert response.status_code == 200, response.text
+        wait_for_rules(client)
+        response = client.post("/transactions/recategorize", data=YEAR)
+        assert response.status_code == 200, response.text
+        assert_consistent(main)
+
+    # Bulk deletes by id, by filter and by upload.
+    response = client.request("DELETE", "/transactions", json={"ids": ids[100:200]})
+    assert response.json() == {"deleted_rows": 100}
+    response = client.request(
+        "DELETE",
+        "/transactions",
+        json={"filter": {"start_date": "2096-03-01", "end_date": "2096-05-31"}},
+    )
+    assert response.status_code == 200, response.text
+    response = client.request("DELETE", "/transactions", json={"ingest_id": uploads[1]})
+    assert response.json()["deleted_rows"]
+    assert_consistent(main)
+
+
+def test_rebuild_rollups_repairs_drift(app_module, uploads):
+    main, _ = app_module
+    with main.engine.begin() as conn:
+        conn.execute(
+            text(
+                "UPDATE transaction_daily_rollups SET row_count = row_count + 1 "
+                "WHERE date BETWEEN :start_date AND :end_date"
+            ),
+            YEAR,
+        )
+        assert rollup_mismatches(conn)
+        rebuild_rollups(conn)
+    assert_consistent(main)
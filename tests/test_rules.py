@@ -0,0 +1,42 @@
+import pytest
+
+from src.rules import InvalidRuleError, validate_keywords, validate_rule_set
+
+
+def rule(*keywords: str) -> dict:
+    return {"category": "food", "sub_category": "", "keywords": list(keywords)}
+
+
+def test_validate_keywords_drops_blanks():
+    assert validate_keywords(["tesco", " ", ""]) == ["tesco"]
+
+
+@pytest.mark.parametrize("keywords", [[], [" "], ["("], ["a(?i)b"]])
+def test_validate_keywords_rejects(keywords):
+    with pytest.raises(InvalidRuleError):
+        validate_keywords(keywords)
+
+
+def test_validate_rule_set_accepts_flags_and_backreferences():
+    validate_rule_set([rule("(x)y"), rule("(?i)tesco", r"(a)\1"), rule("(?x) c a f e  # note")])
+
+
+def test_validate_rule_set_rejects_backreference_pushed_out_of_range():
+    # Valid alone, but 99 groups earlier make "\1" group 101 in the combined pattern.
+    many_groups = rule("(a)" * 99)
+    with pytest.raises(InvalidRuleError):
+        validate_rule_set([many_groups, rule(r"(b)\1")])
+    validate_rule_set([rule(r"(b)\1"), many_groups])
+
+
+@pytest.mark.parametrize(
+    "keyword", ["amazon 123456789", "tesco cd 3314", "pret 08jun25", "pret  a manger"]
+)
+def test_validate_keywords_rejects_what_normalization_strips(keyword):
+    with pytest.raises(InvalidRuleError, match="can never match"):
+        validate_keywords([keyword])
+
+
+def test_validate_keywords_leaves_patterns_and_outer_spaces_alone():
+    keywords = ["tesco ", "uber *trip", r"\d{6,}", "Pret A Manger"]
+    assert validate_keywords(keywords) == keywords